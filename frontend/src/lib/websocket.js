@@ -22,16 +22,11 @@ export function connect() {
   socket.onmessage = (event) => {
     try {
       const data = JSON.parse(event.data)
-      const type = data.type
-      // Dispatch to type-specific listeners
-      const typeListeners = listeners.get(type)
-      if (typeListeners) {
-        typeListeners.forEach((cb) => cb(data))
-      }
-      // Dispatch to wildcard listeners
-      const allListeners = listeners.get('*')
-      if (allListeners) {
-        allListeners.forEach((cb) => cb(data))
+      // Bursts arrive as one batch frame; dispatch each event in order
+      if (data.type === 'batch') {
+        data.events.forEach(dispatch)
+      } else {
+        dispatch(data)
       }
     } catch (err) {
       console.warn('[WS] Parse error:', err)
@@ -48,6 +43,19 @@ export function connect() {
   }
 }
 
+function dispatch(data) {
+  // Dispatch to type-specific listeners
+  const typeListeners = listeners.get(data.type)
+  if (typeListeners) {
+    typeListeners.forEach((cb) => cb(data))
+  }
+  // Dispatch to wildcard listeners
+  const allListeners = listeners.get('*')
+  if (allListeners) {
+    allListeners.forEach((cb) => cb(data))
+  }
+}
+
 export function disconnect() {
   clearTimeout(reconnectTimer)
   socket?.close()
@@ -228,7 +228,7 @@ async def get_event(event_id: str):
 @api_router.get("/conversation")
 async def get_conversation():
     pid = _require_pid()
-    state = repo.get_or_create_conversation(pid)
+    state = repo.get_conversation_state(pid)
 
     # Add live stats from conversation object
     stats = {}
@@ -245,19 +245,13 @@ async def get_messages(
 ):
     pid = _require_pid()
 
-    if before:
-        # Paginate backwards from a specific message
-        messages = repo.get_messages(pid)
-        messages = [m for m in messages if m["id"] < before]
-        messages = messages[-limit:]  # Take last N
-    else:
-        # Get most recent
-        messages = repo.get_recent_messages(pid, count=limit)
+    # Most recent N, or the N just before a given id when paginating backwards
+    messages, total = repo.get_message_window(pid, count=limit, before=before)
 
     return {
         "messages": messages,
         "count": len(messages),
-        "total": repo.count_messages(pid),
+        "total": total,
     }
 
 
@@ -13,6 +13,9 @@
 #   engine_switch  — Brain switched to different model
 #   status         — Periodic status pulse (context usage, etc.)
 #
+# Events that pile up while a client's previous send is in flight arrive
+# together as one {"type": "batch", "events": [...]} frame.
+#
 # Usage in server.py:
 #   from maestro.api.websocket import ws_router, broadcast
 #   app.include_router(ws_router)
@@ -28,19 +31,111 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import time
+from collections import deque
 from typing import Any
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 ws_router = APIRouter()
 
-# Connected clients
-_clients: set[WebSocket] = set()
+# Events a client may fall behind by before it's dropped as too slow
+CLIENT_QUEUE_SIZE = 64
+
+# Periodic events where only the latest matters. Each client holds at most
+# one pending event of each of these types; a newer one replaces it.
+LOSSY_EVENT_TYPES = frozenset({"status", "heartbeat"})
+
+# Lossy events replaced before they were sent
+dropped_events = 0
+
+
+class _Outbox:
+    """A client's pending events: an ordered, bounded queue for most events,
+    plus one latest-wins slot per lossy type. `wake` is set whenever either
+    has something to send.
+    """
+
+    def __init__(self, maxsize: int = CLIENT_QUEUE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.queue: deque[str] = deque()
+        self.latest: dict[str, str] = {}
+        self.wake = asyncio.Event()
+
+    def put(self, payload: str, lossy_type: str | None = None) -> bool:
+        """Queue a payload. Returns False if the ordered queue is full."""
+        global dropped_events
+        if lossy_type:
+            if lossy_type in self.latest:
+                dropped_events += 1
+            self.latest[lossy_type] = payload
+        elif len(self.queue) >= self.maxsize:
+            return False
+        else:
+            self.queue.append(payload)
+        self.wake.set()
+        return True
+
+    def take(self) -> list[str]:
+        """Everything pending: queued events in order, then the latest slots."""
+        payloads = [*self.queue, *self.latest.values()]
+        self.queue.clear()
+        self.latest.clear()
+        self.wake.clear()
+        return payloads
+
+
+# Connected clients, each with its own outbox drained by a pump task.
+# Copy-on-write: connects and disconnects replace the dict, so a broadcast
+# can iterate its snapshot while clients come and go.
+_clients: dict[WebSocket, _Outbox] = {}
 _event_loop: asyncio.AbstractEventLoop | None = None
 
 
+def _add_client(ws: WebSocket, outbox: _Outbox) -> None:
+    global _clients
+    _clients = {**_clients, ws: outbox}
+
+
+def _remove_client(ws: WebSocket) -> None:
+    global _clients
+    if ws in _clients:
+        _clients = {c: o for c, o in _clients.items() if c is not ws}
+
+
+def _encode(event: dict[str, Any]) -> str:
+    return orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+async def _pump(ws: WebSocket, outbox: _Outbox) -> None:
+    """Send a client's pending events. The only writer after connect.
+
+    Waits until something is pending, then takes all of it. A lone event
+    goes out as-is; a burst goes out as one {"type": "batch"} frame.
+    """
+    try:
+        while True:
+            await outbox.wake.wait()
+            payloads = outbox.take()
+            if payloads:
+                await ws.send_text(payloads[0] if len(payloads) == 1 else _batch_frame(payloads))
+    except Exception:
+        _remove_client(ws)
+
+
+def _batch_frame(payloads: list[str]) -> str:
+    """Wrap already-serialized events in a batch envelope without re-encoding them."""
+    return '{"type":"batch","events":[' + ",".join(payloads) + "]}"
+
+
+async def _close_slow_client(ws: WebSocket) -> None:
+    try:
+        await ws.close(code=1013)  # Try again later
+    except Exception:
+        pass
+
+
 # ===================================================================
 # Connection manager
 # ===================================================================
@@ -50,32 +145,35 @@ async def websocket_endpoint(ws: WebSocket):
     """WebSocket endpoint for real-time dashboard updates."""
     global _event_loop
     await ws.accept()
-    _clients.add(ws)
+    outbox = _Outbox()
+    _add_client(ws, outbox)
     _event_loop = asyncio.get_event_loop()
 
-    # Send initial status on connect
+    # Send initial status on connect, before the pump starts so it comes first
     try:
-        await ws.send_json({
+        await ws.send_text(_encode({
             "type": "connected",
             "clients": len(_clients),
             "time": time.time(),
-        })
+        }))
     except Exception:
         pass
 
+    pump = asyncio.create_task(_pump(ws, outbox))
     try:
         # Keep connection alive — listen for pings/close
         while True:
             data = await ws.receive_text()
             # Client can send "ping" for keepalive
             if data == "ping":
-                await ws.send_json({"type": "pong", "time": time.time()})
+                outbox.put(_encode({"type": "pong", "time": time.time()}))
     except WebSocketDisconnect:
         pass
     except Exception:
         pass
     finally:
-        _clients.discard(ws)
+        pump.cancel()
+        _remove_client(ws)
 
 
 # ===================================================================
@@ -83,37 +181,49 @@ async def websocket_endpoint(ws: WebSocket):
 # ===================================================================
 
 async def broadcast(event: dict[str, Any]) -> None:
-    """Push an event to all connected WebSocket clients."""
+    """Push an event to all connected WebSocket clients.
+
+    The event is serialized once and queued for each client; per-client pump
+    tasks do the sending, so one slow dashboard can't hold up the others.
+    Status and heartbeat events replace any unsent one of the same type;
+    a client whose ordered queue overflows is dropped and closed.
+    """
     if not _clients:
         return
-
-    event["time"] = time.time()
-    dead: list[WebSocket] = []
-
-    for ws in _clients:
-        try:
-            await ws.send_json(event)
-        except Exception:
-            dead.append(ws)
-
-    for ws in dead:
-        _clients.discard(ws)
+    _fanout(*_prepare(event))
 
 
 def broadcast_sync(event: dict[str, Any]) -> None:
     """Push an event from synchronous code (heartbeat thread, tool calls).
 
     Safe to call from any thread. No-op if no event loop or no clients.
+    The event is serialized on the calling thread; the loop only gets one
+    callback that queues the payload for each client.
     """
     if not _clients or not _event_loop:
         return
 
     try:
-        asyncio.run_coroutine_threadsafe(broadcast(event), _event_loop)
+        _event_loop.call_soon_threadsafe(_fanout, *_prepare(event))
     except Exception:
         pass  # Best effort — don't crash the caller
 
 
+def _prepare(event: dict[str, Any]) -> tuple[str, str | None]:
+    """Stamp and serialize an event. Returns (payload, lossy type or None)."""
+    event["time"] = time.time()
+    event_type = event.get("type")
+    return _encode(event), event_type if event_type in LOSSY_EVENT_TYPES else None
+
+
+def _fanout(payload: str, lossy_type: str | None) -> None:
+    """Queue a payload for every connected client. Runs on the event loop."""
+    for ws, outbox in _clients.items():
+        if not outbox.put(payload, lossy_type):
+            _remove_client(ws)
+            asyncio.create_task(_close_slow_client(ws))
+
+
 # ===================================================================
 # Convenience emitters (called from conversation, heartbeat, tools)
 # ===================================================================
@@ -12,12 +12,14 @@
 
 from __future__ import annotations
 
-import json
+import re
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import and_
+import orjson
+from sqlalchemy import and_, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from .models import (
@@ -117,15 +119,15 @@ def _normalize_bboxes(value: Any) -> list[dict[str, float]]:
 
 
 def _serialize_bboxes(value: Any) -> str:
-    return json.dumps(_normalize_bboxes(value), separators=(",", ":"), ensure_ascii=True)
+    return orjson.dumps(_normalize_bboxes(value)).decode()
 
 
 def _deserialize_bboxes(raw: str | None) -> list[dict[str, float]]:
     if not raw:
         return []
     try:
-        parsed = json.loads(raw)
-    except (TypeError, json.JSONDecodeError):
+        parsed = orjson.loads(raw)
+    except (TypeError, orjson.JSONDecodeError):
         return []
     return _normalize_bboxes(parsed)
 
@@ -156,7 +158,7 @@ def get_or_create_project(name: str, path: str | None = None) -> dict[str, Any]:
 
 def get_project(project_id: str) -> dict[str, Any] | None:
     with get_session() as s:
-        p = s.query(Project).get(project_id)
+        p = s.get(Project, project_id)
         if not p:
             return None
         return {"id": p.id, "name": p.name, "path": p.path, "created_at": _iso(p.created_at)}
@@ -166,26 +168,30 @@ def get_project(project_id: str) -> dict[str, Any] | None:
 # Workspaces
 # ===================================================================
 
+def _workspace_summary(w: Workspace) -> dict[str, Any]:
+    return {
+        "slug": w.slug,
+        "title": w.title,
+        "description": w.description,
+        "page_count": len(w.pages),
+        "status": w.status,
+        "created": _iso(w.created_at),
+        "updated": _iso(w.updated_at),
+    }
+
+
+def _list_workspace_rows(s: Session, project_id: str) -> list[Workspace]:
+    return (
+        s.query(Workspace)
+        .filter(Workspace.project_id == project_id)
+        .order_by(Workspace.created_at, Workspace.id)
+        .all()
+    )
+
+
 def list_workspaces(project_id: str) -> list[dict[str, Any]]:
     with get_session() as s:
-        workspaces = (
-            s.query(Workspace)
-            .filter(Workspace.project_id == project_id)
-            .order_by(Workspace.created_at)
-            .all()
-        )
-        return [
-            {
-                "slug": w.slug,
-                "title": w.title,
-                "description": w.description,
-                "page_count": len(w.pages),
-                "status": w.status,
-                "created": _iso(w.created_at),
-                "updated": _iso(w.updated_at),
-            }
-            for w in workspaces
-        ]
+        return [_workspace_summary(w) for w in _list_workspace_rows(s, project_id)]
 
 
 def get_workspace(project_id: str, slug: str) -> dict[str, Any] | None:
@@ -237,14 +243,15 @@ def get_workspace(project_id: str, slug: str) -> dict[str, Any] | None:
         }
 
 
-def resolve_workspace_slug(project_id: str, raw_slug: str) -> str | None:
-    """Resolve a workspace slug by exact match, slugified match, or title match."""
-    import re
+_SLUG_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def _slugify(title: str) -> str:
+    return _SLUG_SEPARATORS.sub("_", title.lower()).strip("_") or "workspace"
 
-    def slugify(t: str) -> str:
-        s = re.sub(r"[^a-z0-9]+", "_", t.lower())
-        return re.sub(r"_+", "_", s).strip("_") or "workspace"
 
+def resolve_workspace_slug(project_id: str, raw_slug: str) -> str | None:
+    """Resolve a workspace slug by exact match, slugified match, or title match."""
     with get_session() as s:
         workspaces = s.query(Workspace).filter(Workspace.project_id == project_id).all()
 
@@ -254,7 +261,7 @@ def resolve_workspace_slug(project_id: str, raw_slug: str) -> str | None:
                 return w.slug
 
         # Slugified match
-        slugified = slugify(raw_slug)
+        slugified = _slugify(raw_slug)
         for w in workspaces:
             if w.slug == slugified:
                 return w.slug
@@ -333,8 +340,12 @@ def add_page(project_id: str, slug: str, page_name: str) -> dict[str, Any] | str
         if not w:
             return f"Workspace '{slug}' not found."
 
-        existing = _get_workspace_page(s, w.id, page_name)
-        if existing:
+        # One read of the workspace's page names covers both the duplicate
+        # check and the page count, instead of a lookup plus a COUNT(*).
+        page_names = set(
+            s.scalars(select(WorkspacePage.page_name).where(WorkspacePage.workspace_id == w.id))
+        )
+        if page_name in page_names:
             return f"Page '{page_name}' is already in workspace '{slug}'."
 
         page = WorkspacePage(
@@ -346,13 +357,12 @@ def add_page(project_id: str, slug: str, page_name: str) -> dict[str, Any] | str
         w.updated_at = _utcnow()
         s.flush()
 
-        page_count = s.query(WorkspacePage).filter(WorkspacePage.workspace_id == w.id).count()
         _emit_ws("workspace", "page_added", slug, detail=page_name)
         return {
             "workspace_slug": slug,
             "page_name": page_name,
             "description": "",
-            "page_count": page_count,
+            "page_count": len(page_names) + 1,
         }
 
 
@@ -611,6 +621,18 @@ def _generate_event_id() -> str:
     return f"evt_{uuid.uuid4().hex[:8]}"
 
 
+def _event_summary(e: ScheduleEvent) -> dict[str, Any]:
+    return {
+        "id": e.id,
+        "title": e.title,
+        "start": e.start,
+        "end": e.end,
+        "type": e.type,
+        "notes": e.notes,
+        "created": _iso(e.created_at),
+    }
+
+
 def list_events(
     project_id: str,
     from_date: str | None = None,
@@ -628,18 +650,7 @@ def list_events(
             q = q.filter(ScheduleEvent.type == event_type.lower())
 
         events = q.order_by(ScheduleEvent.start).all()
-        return [
-            {
-                "id": e.id,
-                "title": e.title,
-                "start": e.start,
-                "end": e.end,
-                "type": e.type,
-                "notes": e.notes,
-                "created": _iso(e.created_at),
-            }
-            for e in events
-        ]
+        return [_event_summary(e) for e in events]
 
 
 def get_event(project_id: str, event_id: str) -> dict[str, Any] | None:
@@ -733,22 +744,53 @@ def upcoming_events(project_id: str, days: int = 7) -> list[dict[str, Any]]:
 # Conversation — Messages + State
 # ===================================================================
 
+def _dialect_insert(s: Session):
+    """insert() with ON CONFLICT support for the session's database."""
+    dialect = s.bind.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise ValueError(f"ON CONFLICT insert not supported for dialect: {dialect}")
+
+
+def _conversation_dict(state: ConversationState) -> dict[str, Any]:
+    return {
+        "id": state.id,
+        "summary": state.summary or "",
+        "total_exchanges": state.total_exchanges,
+        "compactions": state.compactions,
+        "last_compaction": _iso(state.last_compaction),
+        "created_at": _iso(state.created_at),
+    }
+
+
 def get_or_create_conversation(project_id: str) -> dict[str, Any]:
-    """Get or create the conversation state for a project."""
+    """Get or create the conversation state for a project.
+
+    One upsert: the no-op DO UPDATE on conflict makes RETURNING hand back
+    the existing row, so there's no SELECT-then-INSERT race. This writes,
+    so read paths use get_conversation_state() instead.
+    """
+    with get_session() as s:
+        stmt = _dialect_insert(s)(ConversationState).values(project_id=project_id)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ConversationState.project_id],
+            set_={"project_id": stmt.excluded.project_id},
+        ).returning(ConversationState)
+        return _conversation_dict(s.scalars(stmt).one())
+
+
+def get_conversation_state(project_id: str) -> dict[str, Any]:
+    """Read the conversation state for a project (plain SELECT).
+
+    Only falls back to creating the row when it doesn't exist yet.
+    """
     with get_session() as s:
         state = s.query(ConversationState).filter(ConversationState.project_id == project_id).first()
-        if not state:
-            state = ConversationState(project_id=project_id)
-            s.add(state)
-            s.flush()
-        return {
-            "id": state.id,
-            "summary": state.summary or "",
-            "total_exchanges": state.total_exchanges,
-            "compactions": state.compactions,
-            "last_compaction": _iso(state.last_compaction),
-            "created_at": _iso(state.created_at),
-        }
+        if state is not None:
+            return _conversation_dict(state)
+    return get_or_create_conversation(project_id)
 
 
 def add_message(project_id: str, role: str, content: str) -> int:
@@ -761,6 +803,24 @@ def add_message(project_id: str, role: str, content: str) -> int:
         return msg.id
 
 
+def add_messages_bulk(project_id: str, messages: list[tuple[str, str]]) -> list[int]:
+    """Add several (role, content) messages in one INSERT and return their ids, in order."""
+    if not messages:
+        return []
+    now = _utcnow()
+    rows = [
+        # Microsecond offsets keep created_at ordering identical to list order
+        {"project_id": project_id, "role": role, "content": content, "created_at": now + timedelta(microseconds=i)}
+        for i, (role, content) in enumerate(messages)
+    ]
+    with get_session() as s:
+        # Autoincrement ids follow insertion order; sort since RETURNING order isn't guaranteed
+        ids = sorted(s.execute(insert(Message).values(rows).returning(Message.id)).scalars())
+    for message_id, (role, content) in zip(ids, messages):
+        _emit_ws("message", role, content[:500] if isinstance(content, str) else "", message_id=message_id)
+    return ids
+
+
 def get_messages(project_id: str, limit: int | None = None, offset: int = 0) -> list[dict[str, Any]]:
     """Get messages ordered by creation time. Newest last."""
     with get_session() as s:
@@ -797,46 +857,125 @@ def get_recent_messages(project_id: str, count: int = 20) -> list[dict[str, Any]
         ]
 
 
+def get_message_window(
+    project_id: str,
+    count: int = 20,
+    before: int | None = None,
+) -> tuple[list[dict[str, Any]], int]:
+    """Get the N most recent messages (only ids < before, if given) plus the total count.
+
+    One session for both, for endpoints that page through the conversation.
+    """
+    with get_session() as s:
+        base = s.query(Message).filter(Message.project_id == project_id)
+        total = base.count()
+        q = base.filter(Message.id < before) if before else base
+        msgs = q.order_by(Message.id.desc()).limit(count).all()
+        msgs.reverse()
+        return [
+            {"id": m.id, "role": m.role, "content": m.content, "created_at": _iso(m.created_at)}
+            for m in msgs
+        ], total
+
+
 def count_messages(project_id: str) -> int:
     with get_session() as s:
         return s.query(Message).filter(Message.project_id == project_id).count()
 
 
+def count_message_chars(project_id: str) -> int:
+    """Total characters across a project's messages, summed in SQL."""
+    with get_session() as s:
+        return s.scalar(
+            select(func.coalesce(func.sum(func.length(Message.content)), 0))
+            .where(Message.project_id == project_id)
+        )
+
+
 def delete_messages_before(project_id: str, message_id: int) -> int:
-    """Delete messages older than the given id. Returns count deleted."""
+    """Delete messages older than the given id. Returns count deleted.
+
+    One bulk DELETE; nothing is loaded, and the fresh session holds no
+    Message objects, so there is nothing to synchronize.
+    """
     with get_session() as s:
-        count = (
-            s.query(Message)
-            .filter(and_(Message.project_id == project_id, Message.id < message_id))
-            .delete()
+        result = s.execute(
+            delete(Message)
+            .where(and_(Message.project_id == project_id, Message.id < message_id))
+            .execution_options(synchronize_session=False)
         )
-        return count
+        return result.rowcount
 
 
 def update_conversation_state(
     project_id: str,
     summary: str | None = None,
-    increment_exchanges: bool = False,
-    increment_compactions: bool = False,
+    increment_exchanges: int = 0,
+    increment_compactions: int = 0,
 ) -> None:
-    """Update conversation metadata."""
+    """Update conversation metadata.
+
+    Counters are incremented in SQL (total_exchanges = total_exchanges + n),
+    so concurrent turns can't lose an update between a read and a write.
+    """
+    values: dict[str, Any] = {}
+    if summary is not None:
+        values["summary"] = summary
+    if increment_exchanges:
+        values["total_exchanges"] = func.coalesce(ConversationState.total_exchanges, 0) + int(increment_exchanges)
+    if increment_compactions:
+        values["compactions"] = func.coalesce(ConversationState.compactions, 0) + int(increment_compactions)
+        values["last_compaction"] = _utcnow()
+
     with get_session() as s:
-        state = s.query(ConversationState).filter(ConversationState.project_id == project_id).first()
-        if not state:
-            state = ConversationState(project_id=project_id)
-            s.add(state)
-
-        if summary is not None:
-            state.summary = summary
-        if increment_exchanges:
-            state.total_exchanges = (state.total_exchanges or 0) + 1
-        if increment_compactions:
-            state.compactions = (state.compactions or 0) + 1
-            state.last_compaction = _utcnow()
+        if values:
+            result = s.execute(
+                update(ConversationState)
+                .where(ConversationState.project_id == project_id)
+                .values(**values)
+            )
+            if result.rowcount:
+                return
 
+        existing = s.query(ConversationState.id).filter(ConversationState.project_id == project_id).first()
+        if existing:
+            return
+        s.add(ConversationState(
+            project_id=project_id,
+            summary=summary if summary is not None else "",
+            total_exchanges=int(increment_exchanges),
+            compactions=int(increment_compactions),
+            last_compaction=_utcnow() if increment_compactions else None,
+        ))
         s.flush()
 
 
+# ===================================================================
+# Snapshot
+# ===================================================================
+
+def get_project_snapshot(project_id: str) -> dict[str, Any]:
+    """Workspaces, schedule, and message count in one session.
+
+    Same shapes as list_workspaces/list_events, for callers that want the
+    whole picture without opening a session per domain.
+    """
+    with get_session() as s:
+        workspaces = [_workspace_summary(w) for w in _list_workspace_rows(s, project_id)]
+        events = (
+            s.query(ScheduleEvent)
+            .filter(ScheduleEvent.project_id == project_id)
+            .order_by(ScheduleEvent.start)
+            .all()
+        )
+        message_count = s.query(Message).filter(Message.project_id == project_id).count()
+        return {
+            "workspaces": workspaces,
+            "events": [_event_summary(e) for e in events],
+            "message_count": message_count,
+        }
+
+
 # ===================================================================
 # Experience Log
 # ===================================================================
@@ -846,6 +985,6 @@ def log_experience(tool: str, details: dict[str, Any]) -> None:
     with get_session() as s:
         entry = ExperienceLog(
             tool=tool,
-            details=json.dumps(details, ensure_ascii=False),
+            details=orjson.dumps(details, option=orjson.OPT_NON_STR_KEYS).decode(),
         )
         s.add(entry)
@@ -20,6 +20,7 @@ from typing import Generator
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import Pool
 
 from .models import Base
 
@@ -49,13 +50,18 @@ engine = create_engine(
 _SessionFactory = sessionmaker(bind=engine, expire_on_commit=False)
 
 
-def configure(url: str) -> None:
-    """Reconfigure the engine (used by tests to inject in-memory SQLite)."""
+def configure(url: str, poolclass: type[Pool] | None = None) -> None:
+    """Reconfigure the engine (used by tests to inject in-memory SQLite).
+
+    Tests pass poolclass=StaticPool with "sqlite://" so every session in the
+    process shares one in-memory connection (and therefore one database).
+    """
     global engine, _SessionFactory
     connect_args = {}
     if url.startswith("sqlite"):
         connect_args["check_same_thread"] = False
-    engine = create_engine(url, connect_args=connect_args, echo=False, pool_pre_ping=True)
+    pool_args = {"poolclass": poolclass} if poolclass else {}
+    engine = create_engine(url, connect_args=connect_args, echo=False, pool_pre_ping=True, **pool_args)
     _SessionFactory = sessionmaker(bind=engine, expire_on_commit=False)
 
 
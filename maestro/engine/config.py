@@ -36,3 +36,6 @@ DEFAULT = "gpt"
 COMPACTION_THRESHOLD = 0.65   # Compact at 65% of context window
 KEEP_RECENT = 20              # Messages to keep in full after compaction
 CHARS_PER_TOKEN = 4           # Rough estimate for token counting
+
+# Side tasks (summaries, rewrites) don't need the flagship model
+COMPACTION_MODEL = "gemini-2.0-flash-lite"
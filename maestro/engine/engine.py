@@ -46,7 +46,7 @@ def setup(engine_name: str | None = None) -> dict[str, Any]:
     project = load_project()
     tool_definitions, tool_functions = build_tool_registry(project)
     identity = load_identity()
-    system_prompt = build_system_prompt()
+    system_prompt = build_system_prompt(project)
 
     return {
         "engine_name": engine_name,
@@ -24,7 +24,7 @@ from __future__ import annotations
 import json
 import random
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
@@ -133,6 +133,30 @@ def should_heartbeat(state: dict[str, Any]) -> bool:
         return True
 
 
+def seconds_until_next_heartbeat(state: dict[str, Any]) -> float:
+    """Seconds until should_heartbeat(state) next becomes true (0 if it already is).
+
+    Lets the server sleep until the next heartbeat is due instead of polling.
+    """
+    now = datetime.now()
+    if is_silent_hours():
+        wake = now.replace(hour=SILENT_HOURS[1], minute=0, second=0, microsecond=0)
+        if wake <= now:
+            wake += timedelta(days=1)
+        return (wake - now).total_seconds()
+
+    last = state.get("last_heartbeat", "")
+    if not last:
+        return 0.0
+
+    try:
+        last_dt = datetime.strptime(last, "%Y-%m-%dT%H:%M:%S")
+    except ValueError:
+        return 0.0
+    due = last_dt + timedelta(minutes=get_interval_minutes())
+    return max(0.0, (due - now).total_seconds())
+
+
 # ---------------------------------------------------------------------------
 # Heartbeat decision engine
 # ---------------------------------------------------------------------------
@@ -125,10 +125,8 @@ def process_message(chat: Any, message: str) -> str:
         parts = getattr(getattr(candidates[0], "content", None), "parts", [])
 
         # Collect ALL function calls in this turn (Gemini can return multiple)
-        function_calls = []
-        for part in parts:
-            if hasattr(part, "function_call") and part.function_call:
-                function_calls.append(part.function_call)
+        # Every Part has a function_call field (unset ones are falsy), so no hasattr needed
+        function_calls = [part.function_call for part in parts if part.function_call]
 
         if not function_calls:
             break
@@ -137,8 +135,9 @@ def process_message(chat: Any, message: str) -> str:
         response_parts = []
         for fc in function_calls:
             func_name = fc.name
-            func_args = dict(fc.args) if fc.args else {}
-            print(f"  [Tool] {func_name}({func_args})")
+            # fc.args is already a read-only mapping — no need to copy it into a dict
+            func_args = fc.args or {}
+            print(f"  [Tool] {func_name}(" + ", ".join(f"{k}={v!r}" for k, v in func_args.items()) + ")")
 
             if func_name in tool_functions:
                 try:
@@ -2,23 +2,44 @@
 #
 # Translates between the engine's generic interface and Anthropic's Messages API.
 # Handles: tool schema conversion, message formatting, multimodal content blocks,
-# and the tool_use loop.
+# streaming, and the tool_use loop.
 
 from __future__ import annotations
 
-import json
+import atexit
+import logging
 import os
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 
 import anthropic
+import httpx
+import orjson
 from dotenv import load_dotenv
 
+from engine.providers.tool_calls import execute_tools
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Keep idle connections around between turns (httpx's default is 5 seconds)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=8, keepalive_expiry=300)
 
+
+@lru_cache(maxsize=1)
 def create_client() -> anthropic.Anthropic:
-    """Create an Anthropic API client."""
-    return anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+    """Create the Anthropic API client.
+
+    One client per process, so engine switches and new conversations reuse
+    its pooled connections instead of paying a fresh TCP/TLS handshake.
+    """
+    client = anthropic.Anthropic(
+        api_key=os.getenv("ANTHROPIC_API_KEY"),
+        http_client=anthropic.DefaultHttpxClient(limits=HTTP_LIMITS),
+    )
+    atexit.register(client.close)
+    return client
 
 
 def build_tool_schemas(tool_definitions: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -40,33 +61,31 @@ def send_message(
     messages: list[dict[str, Any]],
     tools: list[dict[str, Any]],
     tool_functions: dict[str, Any],
+    on_text: Callable[[str], None] | None = None,
 ) -> tuple[list[dict[str, Any]], str]:
     """Send a message and handle the full tool-use loop.
 
     Returns (updated_messages, final_text_response).
     Messages list is updated in place with assistant/tool turns.
+
+    Responses are streamed. If on_text is given, it's called with each text
+    chunk as it arrives, so callers can show output before generation ends.
     """
-    response = client.messages.create(
-        model=model,
-        max_tokens=4096,
-        system=system_prompt,
-        tools=tools,
-        messages=messages,
-    )
+    response = _create_streaming(client, model, system_prompt, messages, tools, on_text)
 
     while response.stop_reason == "tool_use":
         tool_results = []
 
-        for block in response.content:
-            if block.type != "tool_use":
-                continue
+        tool_blocks = [block for block in response.content if block.type == "tool_use"]
+        for block in tool_blocks:
+            logger.info("  [Tool] %s(%s)", block.name, block.input or {})
+        results = execute_tools(
+            [(block.name, block.input or {}) for block in tool_blocks],
+            tool_functions,
+        )
 
-            func_name = block.name
-            func_args = block.input or {}
+        for block, result in zip(tool_blocks, results):
             tool_id = block.id
-            print(f"  [Tool] {func_name}({func_args})")
-
-            result = _execute_tool(func_name, func_args, tool_functions)
             stringified = _stringify_result(result)
 
             if isinstance(stringified, list):
@@ -88,13 +107,7 @@ def send_message(
         messages.append({"role": "assistant", "content": assistant_content})
         messages.append({"role": "user", "content": tool_results})
 
-        response = client.messages.create(
-            model=model,
-            max_tokens=4096,
-            system=system_prompt,
-            tools=tools,
-            messages=messages,
-        )
+        response = _create_streaming(client, model, system_prompt, messages, tools, on_text)
 
     # Extract final text
     final_text = ""
@@ -110,6 +123,38 @@ def send_message(
 # Internal helpers
 # ---------------------------------------------------------------------------
 
+def _cached_system(system_prompt: str) -> list[dict[str, Any]]:
+    """System prompt as a cache breakpoint.
+
+    Tools and system come first in every request and don't change within a
+    conversation, so marking the system block lets Anthropic reuse that
+    prefix instead of re-reading it on each call of the tool loop.
+    """
+    return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+
+def _create_streaming(
+    client: anthropic.Anthropic,
+    model: str,
+    system_prompt: str,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]],
+    on_text: Callable[[str], None] | None,
+) -> Any:
+    """Stream one response, forward text chunks, return the final Message."""
+    with client.messages.stream(
+        model=model,
+        max_tokens=4096,
+        system=_cached_system(system_prompt),
+        tools=tools,
+        messages=messages,
+    ) as stream:
+        if on_text:
+            for text in stream.text_stream:
+                on_text(text)
+        return stream.get_final_message()
+
+
 def _json_schema_from_params(params: dict[str, Any]) -> dict[str, Any]:
     properties: dict[str, Any] = {}
     required: list[str] = []
@@ -118,33 +163,26 @@ def _json_schema_from_params(params: dict[str, Any]) -> dict[str, Any]:
         description = spec.get("description")
         if description:
             field["description"] = description
+        if spec.get("enum"):
+            field["enum"] = list(spec["enum"])
         properties[name] = field
         if spec.get("required", False):
             required.append(name)
     return {"type": "object", "properties": properties, "required": required}
 
 
-def _execute_tool(func_name: str, func_args: dict, tool_functions: dict) -> Any:
-    if func_name in tool_functions:
-        try:
-            return tool_functions[func_name](**func_args) if func_args else tool_functions[func_name]()
-        except Exception as exc:
-            return f"Tool execution error: {exc}"
-    return f"Unknown function: {func_name}"
-
-
 def _stringify_result(result: Any) -> Any:
     """Convert tool result to Anthropic content format.
 
     Multimodal results (list of content blocks with images) pass through.
-    Everything else gets JSON-stringified.
+    Everything else gets compact JSON (no indent) to keep tool-result tokens down.
     """
     if isinstance(result, list) and result and isinstance(result[0], dict):
         if result[0].get("type") in ("image", "text"):
             if any(item.get("type") == "image" for item in result):
                 return result  # Multimodal content blocks
     if isinstance(result, (dict, list)):
-        return json.dumps(result, indent=2, ensure_ascii=True)
+        return orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS).decode()
     return str(result)
 
 
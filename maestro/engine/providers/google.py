@@ -6,15 +6,28 @@
 
 from __future__ import annotations
 
-import json
+import logging
 import os
-from typing import Any
+from typing import Any, Callable
 
 import google.generativeai as genai
+import orjson
 from dotenv import load_dotenv
 
+from engine.providers.tool_calls import execute_tools
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Proto classes used on every tool turn
+_Content = genai.protos.Content
+_Part = genai.protos.Part
+_FunctionResponse = genai.protos.FunctionResponse
+
+# Chat history cap (entries) after tool turns are pruned
+HISTORY_KEEP = 20
+
 
 def create_client() -> None:
     """Configure the Gemini API client. Returns None (genai uses global config)."""
@@ -50,13 +63,17 @@ def send_message(
     message: str,
     tools: list[dict[str, Any]],
     tool_functions: dict[str, Any],
+    on_text: Callable[[str], None] | None = None,
 ) -> str:
     """Send a message and handle the full tool-use loop.
 
     Returns the final text response.
     Note: Gemini uses a stateful chat object, not a messages list.
+
+    Responses are streamed. If on_text is given, it's called with each text
+    chunk as it arrives, so callers can show output before generation ends.
     """
-    response = chat.send_message(message)
+    response = _send_streaming(chat, message, on_text)
 
     while True:
         candidates = getattr(response, "candidates", None) or []
@@ -65,35 +82,29 @@ def send_message(
         parts = getattr(getattr(candidates[0], "content", None), "parts", [])
 
         # Collect ALL function calls in this turn (Gemini can return multiple)
-        function_calls = []
-        for part in parts:
-            if hasattr(part, "function_call") and part.function_call:
-                function_calls.append(part.function_call)
+        # Every Part has a function_call field (unset ones are falsy), so no hasattr needed
+        function_calls = [part.function_call for part in parts if part.function_call]
 
         if not function_calls:
             break
 
         # Execute all function calls and build response parts
-        response_parts = []
+        calls = []
         for fc in function_calls:
             func_name = fc.name
-            func_args = dict(fc.args) if fc.args else {}
-            print(f"  [Tool] {func_name}({func_args})")
-
-            result = _execute_tool(func_name, func_args, tool_functions)
-
-            response_parts.append(
-                genai.protos.Part(
-                    function_response=genai.protos.FunctionResponse(
-                        name=func_name,
-                        response={"result": _stringify_result(result)},
-                    )
-                )
-            )
-
-        response = chat.send_message(
-            genai.protos.Content(parts=response_parts)
-        )
+            # fc.args is already a read-only mapping — no need to copy it into a dict
+            func_args = fc.args or {}
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("  [Tool] %s(%s)", func_name, ", ".join(f"{k}={v!r}" for k, v in func_args.items()))
+            calls.append((func_name, func_args))
+
+        results = [_gemini_result(r) for r in execute_tools(calls, tool_functions)]
+        response_parts = [
+            _build_tool_response(func_name, result)
+            for (func_name, _), result in zip(calls, results)
+        ]
+
+        response = _send_streaming(chat, _Content(parts=response_parts), on_text)
 
     # Extract final text
     final_candidates = getattr(response, "candidates", None) or []
@@ -101,16 +112,71 @@ def send_message(
         getattr(getattr(final_candidates[0], "content", None), "parts", [])
         if final_candidates else []
     )
+    answer = "No response"
     for part in final_parts:
         if getattr(part, "text", None):
-            return part.text
-    return "No response"
+            answer = part.text
+            break
+
+    _prune_history(chat)
+    return answer
 
 
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
 
+def _send_streaming(chat: Any, content: Any, on_text: Callable[[str], None] | None) -> Any:
+    """Send with stream=True, forward text chunks, return the resolved response."""
+    response = chat.send_message(content, stream=True)
+    if on_text:
+        for chunk in response:
+            candidates = getattr(chunk, "candidates", None) or []
+            if not candidates:
+                continue
+            for part in getattr(getattr(candidates[0], "content", None), "parts", []):
+                if getattr(part, "text", None):
+                    on_text(part.text)
+    # Must be fully resolved before reading .candidates for function calls
+    response.resolve()
+    return response
+
+
+def _is_tool_turn(content: Any) -> bool:
+    """True for history entries that carry function calls or function responses."""
+    if getattr(content, "role", "") == "function":
+        return True
+    for part in getattr(content, "parts", []) or []:
+        if getattr(part, "function_call", None) or getattr(part, "function_response", None):
+            return True
+    return False
+
+
+def _prune_history(chat: Any, keep: int = HISTORY_KEEP) -> None:
+    """Drop finished tool turns and cap history so old results aren't resent.
+
+    Keeps only the user messages and final model answers, newest `keep` entries.
+    """
+    history = list(getattr(chat, "history", None) or [])
+    pruned = [content for content in history if not _is_tool_turn(content)]
+    if len(pruned) > keep:
+        pruned = pruned[-keep:]
+    # History has to open on a user turn
+    while pruned and getattr(pruned[0], "role", "") != "user":
+        pruned.pop(0)
+    if len(pruned) != len(history):
+        chat.history = pruned
+
+
+def add_exchange(chat: Any, user_text: str, model_text: str) -> None:
+    """Record an exchange answered without the model so the chat keeps its context."""
+    chat.history = list(chat.history) + [
+        _Content(role="user", parts=[_Part(text=user_text)]),
+        _Content(role="model", parts=[_Part(text=model_text)]),
+    ]
+    _prune_history(chat)
+
+
 def _json_schema_from_params(params: dict[str, Any]) -> dict[str, Any]:
     properties: dict[str, Any] = {}
     required: list[str] = []
@@ -119,6 +185,9 @@ def _json_schema_from_params(params: dict[str, Any]) -> dict[str, Any]:
         description = spec.get("description")
         if description:
             field["description"] = description
+        if spec.get("enum"):
+            field["format"] = "enum"
+            field["enum"] = list(spec["enum"])
         properties[name] = field
         if spec.get("required", False):
             required.append(name)
@@ -128,21 +197,25 @@ def _json_schema_from_params(params: dict[str, Any]) -> dict[str, Any]:
     return schema
 
 
-def _execute_tool(func_name: str, func_args: dict, tool_functions: dict) -> Any:
-    if func_name in tool_functions:
-        try:
-            result = tool_functions[func_name](**func_args) if func_args else tool_functions[func_name]()
-            # Gemini doesn't support multimodal tool results — convert images to text
-            if isinstance(result, list) and result and isinstance(result[0], dict):
-                if any(item.get("type") == "image" for item in result):
-                    return "Image returned. Gemini cannot view images in tool results — use highlight_pages for visual overlays."
-            return result
-        except Exception as exc:
-            return f"Tool execution error: {exc}"
-    return f"Unknown function: {func_name}"
+def _gemini_result(result: Any) -> Any:
+    # Gemini doesn't support multimodal tool results — convert images to text
+    if isinstance(result, list) and result and isinstance(result[0], dict):
+        if any(item.get("type") == "image" for item in result):
+            return "Image returned. Gemini cannot view images in tool results — use highlight_pages for visual overlays."
+    return result
+
+
+def _build_tool_response(func_name: str, result: Any) -> Any:
+    """Wrap a tool result in the FunctionResponse part Gemini expects."""
+    return _Part(
+        function_response=_FunctionResponse(
+            name=func_name,
+            response={"result": _stringify_result(result)},
+        )
+    )
 
 
 def _stringify_result(result: Any) -> str:
     if isinstance(result, (dict, list)):
-        return json.dumps(result, indent=2, ensure_ascii=True)
+        return orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS).decode()
     return str(result)
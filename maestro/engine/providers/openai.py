@@ -1,23 +1,44 @@
 # openai.py — GPT API provider
 #
 # Translates between the engine's generic interface and OpenAI's Chat Completions API.
-# Handles: function tool format, tool_call parsing, and the tool-use loop.
+# Handles: function tool format, tool_call parsing, streaming, and the tool-use loop.
 
 from __future__ import annotations
 
-import json
+import atexit
+import logging
 import os
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 
+import httpx
+import orjson
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from engine.providers.tool_calls import execute_tools
+from openai import DefaultHttpxClient, OpenAI
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Keep idle connections around between turns (httpx's default is 5 seconds)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=8, keepalive_expiry=300)
 
+
+@lru_cache(maxsize=1)
 def create_client() -> OpenAI:
-    """Create an OpenAI API client."""
-    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    """Create the OpenAI API client.
+
+    One client per process, so engine switches and new conversations reuse
+    its pooled connections instead of paying a fresh TCP/TLS handshake.
+    """
+    client = OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=DefaultHttpxClient(limits=HTTP_LIMITS),
+    )
+    atexit.register(client.close)
+    return client
 
 
 def build_tool_schemas(tool_definitions: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -42,52 +63,49 @@ def send_message(
     messages: list[dict[str, Any]],
     tools: list[dict[str, Any]],
     tool_functions: dict[str, Any],
+    on_text: Callable[[str], None] | None = None,
 ) -> tuple[list[dict[str, Any]], str]:
     """Send a message and handle the full tool-use loop.
 
     Returns (updated_messages, final_text_response).
     Messages list is updated in place with assistant/tool turns.
+
+    Responses are streamed. If on_text is given, it's called with each text
+    chunk as it arrives, so callers can show output before generation ends.
     """
     # Ensure system prompt is first message
     if not messages or messages[0].get("role") != "system":
         messages.insert(0, {"role": "system", "content": system_prompt})
 
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages,
-        tools=tools,
-    )
-    message = response.choices[0].message
+    message = _create_streaming(client, model, messages, tools, on_text)
 
-    while message.tool_calls:
+    while message["tool_calls"]:
         messages.append(message)
 
-        for tool_call in message.tool_calls:
-            func_name = tool_call.function.name
-            raw_args = tool_call.function.arguments or "{}"
+        calls = []
+        for tool_call in message["tool_calls"]:
+            func_name = tool_call["function"]["name"]
+            raw_args = tool_call["function"]["arguments"] or "{}"
             try:
-                func_args = json.loads(raw_args)
-            except json.JSONDecodeError:
+                func_args = orjson.loads(raw_args)
+            except orjson.JSONDecodeError:
                 func_args = {}
 
-            print(f"  [Tool] {func_name}({func_args})")
+            logger.info("  [Tool] %s(%s)", func_name, func_args)
+            calls.append((func_name, func_args))
 
-            result = _execute_tool(func_name, func_args, tool_functions)
+        results = execute_tools(calls, tool_functions)
 
+        for tool_call, result in zip(message["tool_calls"], results):
             messages.append({
                 "role": "tool",
-                "tool_call_id": tool_call.id,
+                "tool_call_id": tool_call["id"],
                 "content": _stringify_result(result),
             })
 
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            tools=tools,
-        )
-        message = response.choices[0].message
+        message = _create_streaming(client, model, messages, tools, on_text)
 
-    content = message.content if message.content is not None else "No response"
+    content = message["content"] if message["content"] is not None else "No response"
     return messages, content
 
 
@@ -95,6 +113,55 @@ def send_message(
 # Internal helpers
 # ---------------------------------------------------------------------------
 
+def _create_streaming(
+    client: OpenAI,
+    model: str,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]],
+    on_text: Callable[[str], None] | None,
+) -> dict[str, Any]:
+    """Stream one completion and reassemble it as an assistant message dict.
+
+    Text deltas are forwarded to on_text. Tool calls arrive in fragments
+    (keyed by index) and are stitched together until the stream ends.
+    """
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        tools=tools,
+        stream=True,
+    )
+
+    text_parts: list[str] = []
+    tool_calls: dict[int, dict[str, Any]] = {}
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            text_parts.append(delta.content)
+            if on_text:
+                on_text(delta.content)
+        for fragment in delta.tool_calls or []:
+            call = tool_calls.setdefault(fragment.index, {
+                "id": "",
+                "type": "function",
+                "function": {"name": "", "arguments": ""},
+            })
+            if fragment.id:
+                call["id"] = fragment.id
+            if fragment.function and fragment.function.name:
+                call["function"]["name"] += fragment.function.name
+            if fragment.function and fragment.function.arguments:
+                call["function"]["arguments"] += fragment.function.arguments
+
+    return {
+        "role": "assistant",
+        "content": "".join(text_parts) if text_parts else None,
+        "tool_calls": [tool_calls[i] for i in sorted(tool_calls)],
+    }
+
+
 def _json_schema_from_params(params: dict[str, Any]) -> dict[str, Any]:
     properties: dict[str, Any] = {}
     required: list[str] = []
@@ -103,22 +170,15 @@ def _json_schema_from_params(params: dict[str, Any]) -> dict[str, Any]:
         description = spec.get("description")
         if description:
             field["description"] = description
+        if spec.get("enum"):
+            field["enum"] = list(spec["enum"])
         properties[name] = field
         if spec.get("required", False):
             required.append(name)
     return {"type": "object", "properties": properties, "required": required}
 
 
-def _execute_tool(func_name: str, func_args: dict, tool_functions: dict) -> Any:
-    if func_name in tool_functions:
-        try:
-            return tool_functions[func_name](**func_args) if func_args else tool_functions[func_name]()
-        except Exception as exc:
-            return f"Tool execution error: {exc}"
-    return f"Unknown function: {func_name}"
-
-
 def _stringify_result(result: Any) -> str:
     if isinstance(result, (dict, list)):
-        return json.dumps(result, indent=2, ensure_ascii=True)
+        return orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS).decode()
     return str(result)
@@ -0,0 +1,72 @@
+# tool_calls.py — Tool execution shared by the providers
+#
+# Runs the tool calls from one model turn and returns results in call order.
+# Consecutive read-only calls (knowledge lookups, plans) run concurrently;
+# any call that can write runs by itself, so two writes to the same file or
+# row never race and a read after a write sees the write.
+
+from __future__ import annotations
+
+import inspect
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Mapping
+
+from tools.registry import READ_ONLY_TOOLS
+
+# Upper bound on tool calls run at once when a turn requests several
+MAX_TOOL_WORKERS = 8
+
+# run_plan only dispatches to READ_ONLY_TOOLS, so it's safe to overlap too
+PARALLEL_SAFE_TOOLS = READ_ONLY_TOOLS | {"run_plan"}
+
+
+# fn -> takes args. Weak keys: a tool like switch_engine closes over its
+# Conversation, and the cache must not keep that alive.
+_arity_cache: weakref.WeakKeyDictionary[Any, bool] = weakref.WeakKeyDictionary()
+
+
+def _takes_args(fn: Any) -> bool:
+    """Whether a tool function accepts parameters. Cached per function."""
+    try:
+        return _arity_cache[fn]
+    except KeyError:
+        pass
+    except TypeError:  # Not weak-referenceable; just inspect it
+        return bool(inspect.signature(fn).parameters)
+    takes_args = bool(inspect.signature(fn).parameters)
+    _arity_cache[fn] = takes_args
+    return takes_args
+
+
+def execute_tool(func_name: str, func_args: Mapping[str, Any], tool_functions: dict) -> Any:
+    fn = tool_functions.get(func_name)
+    if fn is not None:
+        try:
+            return fn(**func_args) if _takes_args(fn) else fn()
+        except Exception as exc:
+            return f"Tool execution error: {exc}"
+    return f"Unknown function: {func_name}"
+
+
+def execute_tools(calls: list[tuple[str, Mapping[str, Any]]], tool_functions: dict) -> list[Any]:
+    """Run one turn's tool calls. Results come back in call order."""
+    results: list[Any] = []
+    start = 0
+    while start < len(calls):
+        end = start
+        while end < len(calls) and calls[end][0] in PARALLEL_SAFE_TOOLS:
+            end += 1
+        if end - start >= 2:
+            results.extend(_execute_concurrently(calls[start:end], tool_functions))
+            start = end
+        else:
+            name, args = calls[start]
+            results.append(execute_tool(name, args, tool_functions))
+            start += 1
+    return results
+
+
+def _execute_concurrently(calls: list[tuple[str, Mapping[str, Any]]], tool_functions: dict) -> list[Any]:
+    with ThreadPoolExecutor(max_workers=min(len(calls), MAX_TOOL_WORKERS)) as pool:
+        return list(pool.map(lambda call: execute_tool(call[0], call[1], tool_functions), calls))
@@ -3,9 +3,13 @@
 # Assembles the system prompt from two sources:
 #   1. Identity (static) — soul.json, tone.json (WHO Maestro is)
 #   2. Experience (dynamic) — patterns, tools, disciplines (WHAT Maestro has learned)
+#   3. Project index (optional) — discipline → page map for the loaded project,
+#      plus every sheet summary when the project is small enough to inline
 #
 # The prompt is rebuilt fresh for each conversation.
 # Learning tools modify the experience files; the next prompt picks up changes.
+# Identity + experience text is cached and only re-read when a source file's
+# mtime changes, so repeated builds cost a few stat() calls.
 
 from __future__ import annotations
 
@@ -16,6 +20,12 @@ from typing import Any
 IDENTITY_DIR = Path(__file__).resolve().parent
 EXPERIENCE_DIR = IDENTITY_DIR / "experience"
 
+# Sheet summaries are inlined into the prompt only when they fit in this budget
+INLINE_KNOWLEDGE_MAX_CHARS = 20_000
+
+# (source signature, prompt text) from the last identity + experience build
+_base_prompt_cache: tuple[tuple, str] | None = None
+
 
 def load_identity() -> dict[str, Any]:
     """Load the static identity files (soul.json + tone.json).
@@ -45,8 +55,97 @@ def load_identity() -> dict[str, Any]:
     return identity
 
 
-def build_system_prompt() -> str:
-    """Assemble Maestro's full system prompt from identity + experience."""
+def build_project_index(project: dict[str, Any] | None) -> str:
+    """Render the project's discipline → page map as compact prompt text.
+
+    Putting every page name in the prompt up front lets the model go straight
+    to page tools instead of spending round-trips on list_disciplines/list_pages.
+    """
+    if not project or not project.get("pages"):
+        return ""
+
+    by_discipline: dict[str, list[str]] = {}
+    for name, page in project["pages"].items():
+        discipline = str(page.get("discipline") or "Unknown")
+        by_discipline.setdefault(discipline, []).append(name)
+
+    lines = [
+        "\n### Project Sheets",
+        "Every page by discipline. Use these names directly with page tools.",
+    ]
+    for discipline in sorted(by_discipline, key=str.lower):
+        names = sorted(by_discipline[discipline], key=str.lower)
+        lines.append(f"{discipline}: {', '.join(names)}")
+    return "\n".join(lines)
+
+
+def build_project_knowledge(project: dict[str, Any] | None) -> str:
+    """Render every page's sheet summary as prompt text, if it fits the budget.
+
+    For small projects this answers most questions with no tool calls at all.
+    Large projects return "" and rely on the tools.
+    """
+    if not project or not project.get("pages"):
+        return ""
+
+    entries = []
+    for name in sorted(project["pages"], key=str.lower):
+        reflection = str(project["pages"][name].get("sheet_reflection") or "").strip()
+        if reflection:
+            entries.append(f"[{name}] {reflection}")
+
+    text = "\n".join(entries)
+    if not text or len(text) > INLINE_KNOWLEDGE_MAX_CHARS:
+        return ""
+    return (
+        "\n### Project Knowledge\n"
+        "Sheet summaries for every page. Answer from these when they're enough; "
+        "use tools for region detail.\n" + text
+    )
+
+
+def build_system_prompt(project: dict[str, Any] | None = None) -> str:
+    """Assemble Maestro's full system prompt from identity + experience.
+
+    If a project is given, its discipline → page index is appended, followed
+    by its sheet summaries when they're small enough to inline.
+    """
+    global _base_prompt_cache
+    # Learning writes are debounced; put them on disk so the prompt sees them
+    from tools.learning import flush_pending_writes
+    flush_pending_writes()
+
+    signature = _source_signature()
+    if _base_prompt_cache is None or _base_prompt_cache[0] != signature:
+        _base_prompt_cache = (signature, _build_base_prompt())
+    prompt = _base_prompt_cache[1]
+
+    for section in (build_project_index(project), build_project_knowledge(project)):
+        if section:
+            prompt = f"{prompt}\n{section}"
+    return prompt
+
+
+def _source_signature() -> tuple:
+    """(path, mtime) for every file the base prompt reads."""
+    paths = [
+        IDENTITY_DIR / "soul.json",
+        IDENTITY_DIR / "tone.json",
+        EXPERIENCE_DIR / "tools.json",
+        EXPERIENCE_DIR / "patterns.json",
+        *sorted((EXPERIENCE_DIR / "disciplines").glob("*.json")),
+    ]
+    signature = []
+    for path in paths:
+        try:
+            signature.append((str(path), path.stat().st_mtime_ns))
+        except OSError:
+            signature.append((str(path), None))
+    return tuple(signature)
+
+
+def _build_base_prompt() -> str:
+    """Identity + experience sections of the system prompt."""
     parts: list[str] = []
 
     # --- Identity (static) ---
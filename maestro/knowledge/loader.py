@@ -1,4 +1,4 @@
-# knowledge_v13.py - Load project knowledge from knowledge_store/
+# loader.py - Load project knowledge from knowledge_store/
 
 from __future__ import annotations
 
@@ -13,14 +13,17 @@
 from __future__ import annotations
 
 import json
+import re
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from engine.config import PROVIDERS, DEFAULT, COMPACTION_THRESHOLD, KEEP_RECENT, CHARS_PER_TOKEN
+from engine.config import (
+    PROVIDERS, DEFAULT, COMPACTION_THRESHOLD, KEEP_RECENT, CHARS_PER_TOKEN, COMPACTION_MODEL,
+)
 from knowledge.loader import load_project
 from identity.prompt import build_system_prompt
 from tools.registry import build_tool_registry
@@ -38,21 +41,22 @@ def _estimate_tokens(text: str) -> int:
 
 
 def _estimate_messages_tokens(messages: list[dict[str, Any]]) -> int:
-    """Estimate total tokens across all messages."""
-    total = 0
+    """Estimate total tokens across all messages.
+
+    Character counts are summed first and divided once, instead of
+    estimating (and rounding) every message separately.
+    """
+    chars = 0
     for msg in messages:
         content = msg.get("content", "")
         if isinstance(content, str):
-            total += _estimate_tokens(content)
+            chars += len(content)
         elif isinstance(content, list):
             for block in content:
-                if isinstance(block, dict):
-                    total += _estimate_tokens(json.dumps(block))
-                else:
-                    total += _estimate_tokens(str(block))
+                chars += len(json.dumps(block) if isinstance(block, dict) else str(block))
         else:
-            total += _estimate_tokens(str(content))
-    return total
+            chars += len(str(content))
+    return chars // CHARS_PER_TOKEN
 
 
 # ---------------------------------------------------------------------------
@@ -124,7 +128,7 @@ def _build_compaction_prompt(existing_summary: str, old_text: str) -> str:
     return "\n".join(parts)
 
 
-def _summarize_with_gemini_flash(prompt: str) -> str:
+def _summarize_with_gemini_flash(prompt: str, model_name: str = COMPACTION_MODEL) -> str:
     import google.generativeai as genai
     import os
     from dotenv import load_dotenv
@@ -132,7 +136,7 @@ def _summarize_with_gemini_flash(prompt: str) -> str:
     load_dotenv()
     genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
-    model = genai.GenerativeModel("gemini-2.0-flash")
+    model = genai.GenerativeModel(model_name)
     response = model.generate_content(prompt)
     return response.text.strip()
 
@@ -144,6 +148,53 @@ def _fallback_summary(existing_summary: str, old_text: str) -> str:
     return truncated
 
 
+# ---------------------------------------------------------------------------
+# Direct routing — simple lookups answered without calling the model
+# ---------------------------------------------------------------------------
+
+_ROUTE_DISCIPLINES = re.compile(r"^(?:list\s+)?(?:all\s+)?(?:the\s+)?disciplines\??$", re.IGNORECASE)
+_ROUTE_PAGES = re.compile(r"^(?:list\s+)?(?:all\s+)?(?:the\s+)?pages?\s+(?:in|for)\s+([\w &/-]+?)\??$", re.IGNORECASE)
+_ROUTE_SHEET = re.compile(
+    r"^(?:(?:what(?:'s|\s+is)\s+on|show(?:\s+me)?|summari[sz]e)\s+(?:sheet\s+|page\s+)?)?"
+    r"([A-Z]{1,3}-?\d{3}(?:\.\d+)?)\??$",
+    re.IGNORECASE,
+)
+
+
+def _try_direct_route(message: str, tool_functions: dict[str, Any]) -> str | None:
+    """Answer trivial lookups straight from the tools.
+
+    Handles "list disciplines", "pages in <discipline>", and a sheet number
+    on its own or asked about directly ("A111", "what's on E101", "show me
+    sheet S-101"). Returns None when the message needs the model.
+    """
+    text = message.strip()
+
+    if _ROUTE_DISCIPLINES.match(text) and "list_disciplines" in tool_functions:
+        result = tool_functions["list_disciplines"]()
+        if isinstance(result, list) and result:
+            return "Disciplines: " + ", ".join(str(d) for d in result)
+        return None
+
+    match = _ROUTE_PAGES.match(text)
+    if match and "list_pages" in tool_functions:
+        result = tool_functions["list_pages"](discipline=match.group(1).strip())
+        if isinstance(result, list) and result:
+            return "\n".join(str(p.get("name", "")) for p in result)
+        return None
+
+    match = _ROUTE_SHEET.match(text)
+    if match and "get_sheet_summary" in tool_functions:
+        result = tool_functions["get_sheet_summary"](page_name=match.group(1))
+        if not isinstance(result, str) or not result:
+            return None
+        if result.startswith("No project loaded") or (result.startswith("Page '") and "not found" in result):
+            return None
+        return result
+
+    return None
+
+
 # ---------------------------------------------------------------------------
 # Conversation class — DB-backed
 # ---------------------------------------------------------------------------
@@ -175,21 +226,11 @@ class Conversation:
             self.project_id = p["id"]
 
         # Initialize tools + system prompt (registry handles init of workspaces + schedule)
-        self.tool_definitions, self.tool_functions = build_tool_registry(self.project, project_id=self.project_id)
-        self.system_prompt = build_system_prompt()
-
-        # Estimate fixed token costs
-        tools_text = json.dumps(self.tool_definitions)
-        self._fixed_tokens = _estimate_tokens(self.system_prompt) + _estimate_tokens(tools_text)
-
-        # Per-provider setup
-        self._client = None
-        self._tools = None
-        self._chat = None
-        self._init_provider()
-
-        # Ensure conversation state exists in DB
-        repo.get_or_create_conversation(self.project_id)
+        # Copies: the registry may hand back a shared, cached build
+        tool_definitions, tool_functions = build_tool_registry(self.project, project_id=self.project_id)
+        self.tool_definitions = list(tool_definitions)
+        self.tool_functions = dict(tool_functions)
+        self.system_prompt = build_system_prompt(self.project)
 
         # Register the brain-switch tool
         self.tool_functions["switch_engine"] = lambda engine: self.switch_engine(engine)
@@ -212,38 +253,45 @@ class Conversation:
             },
         })
 
-        self._rebuild_tool_schemas()
+        # Estimate fixed token costs (tool definitions are final from here on)
+        tools_text = json.dumps(self.tool_definitions)
+        self._fixed_tokens = _estimate_tokens(self.system_prompt) + _estimate_tokens(tools_text)
+
+        # Per-provider setup. Tool schemas are converted once per provider and
+        # reused across engine switches.
+        self._client = None
+        self._tools = None
+        self._chat = None
+        self._tool_schemas: dict[str, list[dict[str, Any]]] = {}
+        self._init_provider()
+
+        # Ensure conversation state exists in DB
+        repo.get_or_create_conversation(self.project_id)
 
     def _init_provider(self):
         if self.provider_name == "anthropic":
             from engine.providers.anthropic import create_client, build_tool_schemas
             self._client = create_client()
-            self._tools = build_tool_schemas(self.tool_definitions)
+            self._tools = self._get_tool_schemas(build_tool_schemas)
         elif self.provider_name == "google":
             from engine.providers.google import create_client, build_tool_schemas, create_chat
             create_client()
-            self._tools = build_tool_schemas(self.tool_definitions)
+            self._tools = self._get_tool_schemas(build_tool_schemas)
             self._chat = create_chat(self.model, self.system_prompt, self._tools)
         elif self.provider_name == "openai":
             from engine.providers.openai import create_client, build_tool_schemas
             self._client = create_client()
-            self._tools = build_tool_schemas(self.tool_definitions)
+            self._tools = self._get_tool_schemas(build_tool_schemas)
 
-    def _rebuild_tool_schemas(self):
-        if self.provider_name == "anthropic":
-            from engine.providers.anthropic import build_tool_schemas
-            self._tools = build_tool_schemas(self.tool_definitions)
-        elif self.provider_name == "google":
-            from engine.providers.google import build_tool_schemas, create_chat
-            self._tools = build_tool_schemas(self.tool_definitions)
-            self._chat = create_chat(self.model, self.system_prompt, self._tools)
-        elif self.provider_name == "openai":
-            from engine.providers.openai import build_tool_schemas
-            self._tools = build_tool_schemas(self.tool_definitions)
+    def _get_tool_schemas(self, build_tool_schemas: Callable) -> list[dict[str, Any]]:
+        """Provider tool schemas for the current provider, built on first use."""
+        if self.provider_name not in self._tool_schemas:
+            self._tool_schemas[self.provider_name] = build_tool_schemas(self.tool_definitions)
+        return self._tool_schemas[self.provider_name]
 
     def _get_summary(self) -> str:
         """Get the conversation summary from DB."""
-        state = repo.get_or_create_conversation(self.project_id)
+        state = repo.get_conversation_state(self.project_id)
         return state.get("summary", "")
 
     def _get_messages(self) -> list[dict[str, Any]]:
@@ -272,11 +320,24 @@ class Conversation:
         messages.extend(self._get_messages())
         return messages
 
-    def send(self, message: str) -> str:
+    def send(self, message: str, on_text: Callable[[str], None] | None = None) -> str:
         """Send a message and get Maestro's response.
 
         This is the single entry point. Everything goes through here.
+        on_text (optional) receives text chunks as they stream in.
         """
+        # Trivial lookups skip the model entirely (both messages in one insert)
+        direct = _try_direct_route(message, self.tool_functions)
+        if direct is not None:
+            repo.add_messages_bulk(self.project_id, [("user", message), ("assistant", direct)])
+            repo.update_conversation_state(self.project_id, increment_exchanges=1)
+            if self.provider_name == "google":
+                # The Gemini chat keeps its own history; give it this exchange too
+                from engine.providers.google import add_exchange
+                add_exchange(self._chat, message, direct)
+            self._maybe_compact()
+            return direct
+
         # Add user message to DB
         repo.add_message(self.project_id, "user", message)
 
@@ -288,11 +349,11 @@ class Conversation:
 
         # Send through provider
         if self.provider_name == "anthropic":
-            answer = self._send_anthropic(api_messages)
+            answer = self._send_anthropic(api_messages, on_text)
         elif self.provider_name == "google":
-            answer = self._send_google(message)
+            answer = self._send_google(message, on_text)
         elif self.provider_name == "openai":
-            answer = self._send_openai(api_messages)
+            answer = self._send_openai(api_messages, on_text)
         else:
             answer = "Engine not configured."
 
@@ -300,40 +361,44 @@ class Conversation:
         repo.add_message(self.project_id, "assistant", answer)
 
         # Increment exchange count
-        repo.update_conversation_state(self.project_id, increment_exchanges=True)
+        repo.update_conversation_state(self.project_id, increment_exchanges=1)
 
         return answer
 
-    def _send_anthropic(self, messages: list[dict[str, Any]]) -> str:
+    def _send_anthropic(self, messages: list[dict[str, Any]], on_text: Callable[[str], None] | None = None) -> str:
         from engine.providers.anthropic import send_message
         messages, answer = send_message(
             self._client, self.model, self.system_prompt,
             messages, self._tools, self.tool_functions,
+            on_text=on_text,
         )
         return answer
 
-    def _send_google(self, message: str) -> str:
+    def _send_google(self, message: str, on_text: Callable[[str], None] | None = None) -> str:
         from engine.providers.google import send_message
         return send_message(
             self._chat, self.model, self.system_prompt,
             message, self._tools, self.tool_functions,
+            on_text=on_text,
         )
 
-    def _send_openai(self, messages: list[dict[str, Any]]) -> str:
+    def _send_openai(self, messages: list[dict[str, Any]], on_text: Callable[[str], None] | None = None) -> str:
         from engine.providers.openai import send_message
         messages, answer = send_message(
             self._client, self.model, self.system_prompt,
             messages, self._tools, self.tool_functions,
+            on_text=on_text,
         )
         return answer
 
     def _maybe_compact(self) -> None:
         """Check context usage and compact if needed."""
         summary = self._get_summary()
-        messages = self._get_messages()
 
+        # The check runs every turn; the database sums message lengths so the
+        # rows are only loaded when a compaction is actually due.
         summary_tokens = _estimate_tokens(summary)
-        message_tokens = _estimate_messages_tokens(messages)
+        message_tokens = repo.count_message_chars(self.project_id) // CHARS_PER_TOKEN
 
         if not _needs_compaction(
             self._fixed_tokens, summary_tokens, message_tokens, self.context_limit
@@ -344,15 +409,13 @@ class Conversation:
         print(f"\n[Compaction] Triggering — estimated {total} tokens "
               f"({total / self.context_limit:.0%} of {self.context_limit})")
 
-        if len(messages) <= KEEP_RECENT:
-            return  # Nothing to compact
-
-        # Split: old to summarize, recent to keep
-        old_messages = messages[:-KEEP_RECENT]
         # We need the DB message IDs to know what to delete
         all_rows = repo.get_messages(self.project_id)
         if len(all_rows) <= KEEP_RECENT:
-            return
+            return  # Nothing to compact
+
+        # Split: old to summarize, recent to keep
+        old_messages = [{"role": r["role"], "content": r["content"]} for r in all_rows[:-KEEP_RECENT]]
 
         cutoff_id = all_rows[-KEEP_RECENT]["id"]  # Keep messages with id >= this
 
@@ -373,7 +436,7 @@ class Conversation:
         repo.update_conversation_state(
             self.project_id,
             summary=new_summary,
-            increment_compactions=True,
+            increment_compactions=1,
         )
 
         remaining_tokens = _estimate_tokens(new_summary) + _estimate_messages_tokens(
@@ -401,9 +464,6 @@ class Conversation:
 
         self._init_provider()
 
-        tools_text = json.dumps(self.tool_definitions)
-        self._fixed_tokens = _estimate_tokens(self.system_prompt) + _estimate_tokens(tools_text)
-
         self._maybe_compact()
 
         return f"Switched from {old_engine} to {engine_name} ({provider_config['display']}). Conversation preserved."
@@ -417,7 +477,7 @@ class Conversation:
         message_tokens = _estimate_messages_tokens(messages)
         total_tokens = self._fixed_tokens + summary_tokens + message_tokens
 
-        state = repo.get_or_create_conversation(self.project_id)
+        state = repo.get_conversation_state(self.project_id)
 
         return {
             "engine": self.engine_name,
@@ -5,6 +5,8 @@
 
 from __future__ import annotations
 
+import re
+from bisect import bisect_left
 from typing import Any
 
 from knowledge.loader import load_project
@@ -17,6 +19,64 @@ def _no_project() -> str:
     return "No project loaded. Run: python ingest.py <folder>"
 
 
+# A bare sheet number as users type it: "A111", "S-101", "e101", "A2.1"
+_SHEET_CODE = re.compile(r"^[A-Za-z]{1,3}[-_.]?\d+(?:\.\d+)?$")
+_CODE_SEPARATORS = re.compile(r"[-_.]")
+_NAME_BREAK = re.compile(r"[\s_]")
+
+
+def _code_key(code: str) -> str:
+    """Comparable form of a sheet number: lowercase, no separators (S-101 → s101)."""
+    return _CODE_SEPARATORS.sub("", code.lower())
+
+
+class _PageIndex:
+    """Lookup structures over project["pages"], built once per loaded project.
+
+    `by_lower` makes case-insensitive exact lookups a single dict probe, and
+    `by_code` does the same for bare sheet numbers ("a111" → "A111_Floor_...");
+    `names` is sorted so prefix matches are a bisect instead of a full scan;
+    `lowered` holds each name's lowercase form so substring matches don't
+    re-lowercase every page name on every call. `by_discipline` groups page
+    names under their lowercased discipline for list_pages.
+    """
+
+    def __init__(self, pages: dict[str, Any]):
+        self.pages = pages
+        self.order = {name: i for i, name in enumerate(pages)}
+        self.names = sorted(pages)
+        self.lowered = [(name.lower(), name) for name in pages]
+        self.by_lower: dict[str, str] = {}
+        self.by_code: dict[str, str] = {}
+        self.by_discipline: dict[str, list[str]] = {}
+        for lowered, name in self.lowered:
+            self.by_lower.setdefault(lowered, name)
+            self.by_code.setdefault(_code_key(_NAME_BREAK.split(name, maxsplit=1)[0]), name)
+            discipline = str(pages[name].get("discipline", "")).lower()
+            self.by_discipline.setdefault(discipline, []).append(name)
+
+    def prefixed(self, prefix: str) -> list[str]:
+        """Page names starting with prefix, in project order."""
+        start = bisect_left(self.names, prefix)
+        matches = []
+        for name in self.names[start:]:
+            if not name.startswith(prefix):
+                break
+            matches.append(name)
+        return sorted(matches, key=self.order.__getitem__)
+
+
+_page_index: _PageIndex | None = None
+
+
+def _get_page_index() -> _PageIndex:
+    global _page_index
+    pages = project.get("pages", {})
+    if _page_index is None or _page_index.pages is not pages:
+        _page_index = _PageIndex(pages)
+    return _page_index
+
+
 def _resolve_page(page_name: str) -> dict[str, Any] | None:
     """Fuzzy-match a page name. Tries exact match first, then prefix/substring."""
     if not project:
@@ -27,30 +87,32 @@ def _resolve_page(page_name: str) -> dict[str, Any] | None:
     if page_name in pages:
         return pages[page_name]
 
+    # Case-insensitive exact match
+    index = _get_page_index()
+    exact = index.by_lower.get(page_name.lower())
+    if exact:
+        return pages[exact]
+
+    # Bare sheet number (e.g. "a111", "S-101")
+    if _SHEET_CODE.match(page_name):
+        coded = index.by_code.get(_code_key(page_name))
+        if coded:
+            return pages[coded]
+
     # Normalize: replace dots/dashes/spaces with underscores, strip _p001 suffix
     normalized = page_name.replace(".", "_").replace("-", "_").replace(" ", "_").strip("_")
 
     # Try prefix match (e.g. "A111" matches "A111_Floor_Finish_Plan_p001")
-    candidates = []
-    for name, page in pages.items():
-        if name.startswith(normalized) or name.startswith(normalized + "_"):
-            candidates.append((name, page))
-
-    if len(candidates) == 1:
-        return candidates[0][1]
+    candidates = index.prefixed(normalized)
 
     # Try substring match (e.g. "Floor_Finish" matches "A111_Floor_Finish_Plan_p001")
     if not candidates:
         lower = normalized.lower()
-        for name, page in pages.items():
-            if lower in name.lower():
-                candidates.append((name, page))
+        candidates = [name for lowered, name in index.lowered if lower in lowered]
 
-    if len(candidates) == 1:
-        return candidates[0][1]
     if candidates:
         # Multiple matches — return first but this is still better than nothing
-        return candidates[0][1]
+        return pages[candidates[0]]
 
     return None
 
@@ -75,11 +137,13 @@ def list_pages(discipline: str | None = None) -> list[dict[str, Any]] | str:
     if not project:
         return _no_project()
 
+    index = _get_page_index()
+    names = index.by_discipline.get(discipline.lower(), []) if discipline else index.pages
+
     pages: list[dict[str, Any]] = []
-    for name, page in project.get("pages", {}).items():
+    for name in names:
+        page = index.pages[name]
         page_discipline = str(page.get("discipline", ""))
-        if discipline and page_discipline.lower() != discipline.lower():
-            continue
         pages.append(
             {
                 "name": name,
@@ -11,10 +11,20 @@
 #
 # Identity files (soul.json, tone.json) are on the denylist and cannot be modified.
 # Everything in experience/ is fair game.
+#
+# Experience writes are debounced: the in-memory copy updates immediately and
+# the file is written once things go quiet for SAVE_DELAY_SECONDS. Pending
+# writes are flushed at exit. Writes whose content matches what's already on
+# disk are skipped. build_system_prompt flushes first, so a new prompt always
+# sees pending learning.
 
 from __future__ import annotations
 
+import atexit
+import copy
+import hashlib
 import json
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -26,6 +36,102 @@ EXPERIENCE_DIR = IDENTITY_DIR / "experience"
 # Denylist — these files cannot be modified by learning tools
 DENYLIST = {"soul.json", "tone.json"}
 
+# Debounce window for experience file writes
+SAVE_DELAY_SECONDS = 2.0
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+def _write_if_changed(path: Path, data: Any, original_text: str) -> None:
+    """Write data as JSON unless it serializes to exactly what was read."""
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    if text != original_text:
+        path.write_text(text, encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Debounced experience writes
+# ---------------------------------------------------------------------------
+
+class _ExperienceWriter:
+    """Holds pending experience writes and the debounce timer.
+
+    Learning tools run on the webhook and heartbeat threads, so all state
+    lives on this one object behind a lock instead of in module globals.
+    """
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self._pending: dict[Path, dict[str, Any]] = {}
+        self._on_disk: dict[Path, bytes] = {}  # digest of each file's last known content
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def read(self, path: Path) -> dict[str, Any]:
+        """Read an experience file, preferring a pending (not yet written) copy.
+
+        Returns a private copy. Pending data is never mutated in place:
+        callers edit their copy and hand it back through schedule(), which
+        swaps it in whole. A flush on the timer thread can't see a half-edited dict.
+        """
+        with self._lock:
+            if path in self._pending:
+                return copy.deepcopy(self._pending[path])
+        text = path.read_text(encoding="utf-8")
+        data = json.loads(text)
+        with self._lock:
+            self._on_disk[path] = _digest(text)
+        return data
+
+    def schedule(self, path: Path, data: dict[str, Any]) -> None:
+        """Queue a write and restart the debounce timer."""
+        with self._lock:
+            self._pending[path] = data
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Write every pending experience file to disk now.
+
+        Entries stay in _pending until their write has finished, so a read()
+        during the write still sees the new data rather than the old file.
+        _write_lock keeps two flushes (timer and atexit) from interleaving.
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending = dict(self._pending)
+                on_disk = dict(self._on_disk)
+
+            for path, data in pending.items():
+                # Safe outside the lock: pending data is replaced, never mutated
+                text = json.dumps(data, indent=2, ensure_ascii=False)
+                digest = _digest(text)
+                if on_disk.get(path) != digest:
+                    path.write_text(text, encoding="utf-8")
+                with self._lock:
+                    self._on_disk[path] = digest
+                    # A newer schedule() may have replaced it mid-write; keep that one
+                    if self._pending.get(path) is data:
+                        del self._pending[path]
+
+
+_writer = _ExperienceWriter(SAVE_DELAY_SECONDS)
+atexit.register(_writer.flush)
+
+
+def flush_pending_writes() -> None:
+    """Write any debounced experience changes to disk immediately."""
+    _writer.flush()
+
 
 # ---------------------------------------------------------------------------
 # Changelog / Audit — now goes to DB
@@ -53,7 +159,7 @@ def update_experience(file: str, action: str, field: str, value: str, reasoning:
         return f"SKIP: {file} is not a JSON file"
 
     try:
-        data = json.loads(target.read_text(encoding="utf-8"))
+        data = _writer.read(target)
     except (json.JSONDecodeError, OSError) as exc:
         return f"ERROR reading {file}: {exc}"
 
@@ -83,7 +189,7 @@ def update_experience(file: str, action: str, field: str, value: str, reasoning:
         result = f"SKIP: unknown action '{action}'"
 
     if result.startswith("OK"):
-        target.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        _writer.schedule(target, data)
 
     _log_change("update_experience", {
         "file": file, "action": action, "field": field,
@@ -104,7 +210,7 @@ def update_tool_description(tool_name: str, tips: str) -> str:
         return "NOT FOUND: tools.json missing"
 
     try:
-        data = json.loads(tools_path.read_text(encoding="utf-8"))
+        data = _writer.read(tools_path)
     except (json.JSONDecodeError, OSError) as exc:
         return f"ERROR reading tools.json: {exc}"
 
@@ -112,7 +218,7 @@ def update_tool_description(tool_name: str, tips: str) -> str:
         data["tool_tips"] = {}
 
     data["tool_tips"][tool_name] = tips
-    tools_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    _writer.schedule(tools_path, data)
 
     _log_change("update_tool_description", {
         "tool_name": tool_name, "tips": tips[:500],
@@ -158,12 +264,13 @@ def update_knowledge(
             return f"No pass2.json for region '{region_id}'"
 
         try:
-            data = json.loads(pass2_path.read_text(encoding="utf-8"))
+            original = pass2_path.read_text(encoding="utf-8")
+            data = json.loads(original)
         except (json.JSONDecodeError, OSError) as exc:
             return f"ERROR reading pass2.json: {exc}"
 
         data["content_markdown"] = value
-        pass2_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        _write_if_changed(pass2_path, data, original)
         pointer["content_markdown"] = value
         result = f"OK: updated {page_name}/{region_id} content_markdown"
 
@@ -173,7 +280,8 @@ def update_knowledge(
             return f"No pass1.json for page '{page_name}'"
 
         try:
-            data = json.loads(pass1_path.read_text(encoding="utf-8"))
+            original = pass1_path.read_text(encoding="utf-8")
+            data = json.loads(original)
         except (json.JSONDecodeError, OSError) as exc:
             return f"ERROR reading pass1.json: {exc}"
 
@@ -216,7 +324,7 @@ def update_knowledge(
             result = f"SKIP: unknown field '{field}' for page update"
 
         if result.startswith("OK"):
-            pass1_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+            _write_if_changed(pass1_path, data, original)
 
     _log_change("update_knowledge", {
         "page_name": page_name, "field": field, "region_id": region_id,
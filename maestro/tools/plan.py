@@ -0,0 +1,69 @@
+# plan.py — Run several knowledge lookups in one tool call
+#
+# run_plan takes a tiny script of tool calls, e.g.
+#     pages = list_pages("Mechanical"); summary = get_sheet_summary("M102")
+# and runs it locally, so a chain of lookups costs one model round-trip
+# instead of one per call.
+#
+# The plan is parsed with ast, never executed as Python. Each statement must
+# be `call(...)` or `name = call(...)`, the call must be a read-only knowledge
+# tool, and every argument must be a literal.
+
+from __future__ import annotations
+
+import ast
+from typing import Any, Callable
+
+MAX_PLAN_STEPS = 20
+
+
+def run_plan(plan: str, tool_functions: dict[str, Callable], allowed: set[str]) -> dict[str, Any] | str:
+    """Run a plan of tool calls in order. Returns {result_name: result}.
+
+    Assigned calls are keyed by their variable name; bare calls by
+    "<step>_<tool>" (e.g. "1_list_disciplines").
+    """
+    try:
+        tree = ast.parse(plan.strip())
+    except SyntaxError as exc:
+        return f"Invalid plan: {exc.msg} (line {exc.lineno})"
+
+    if not tree.body:
+        return "Plan is empty."
+    if len(tree.body) > MAX_PLAN_STEPS:
+        return f"Plan has {len(tree.body)} steps; the limit is {MAX_PLAN_STEPS}."
+
+    steps: list[tuple[str, str, list[Any], dict[str, Any]]] = []
+    for number, statement in enumerate(tree.body, start=1):
+        if isinstance(statement, ast.Assign) and len(statement.targets) == 1 and isinstance(statement.targets[0], ast.Name):
+            key = statement.targets[0].id
+            call = statement.value
+        elif isinstance(statement, ast.Expr):
+            key = None
+            call = statement.value
+        else:
+            return f"Step {number}: only `tool(...)` or `name = tool(...)` is allowed."
+
+        if not isinstance(call, ast.Call) or not isinstance(call.func, ast.Name):
+            return f"Step {number}: expected a tool call."
+        func_name = call.func.id
+        if func_name not in allowed or func_name not in tool_functions:
+            return f"Step {number}: '{func_name}' can't be used in a plan. Allowed: {', '.join(sorted(allowed))}"
+
+        try:
+            if any(kw.arg is None for kw in call.keywords):
+                raise ValueError("**kwargs")
+            args = [ast.literal_eval(arg) for arg in call.args]
+            kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords}
+        except ValueError:
+            return f"Step {number}: arguments must be literal values."
+
+        steps.append((key or f"{number}_{func_name}", func_name, args, kwargs))
+
+    results: dict[str, Any] = {}
+    for key, func_name, args, kwargs in steps:
+        try:
+            results[key] = tool_functions[func_name](*args, **kwargs)
+        except Exception as exc:
+            results[key] = f"Tool execution error: {exc}"
+    return results
@@ -8,14 +8,19 @@
 #   - vision.py     — async Gemini workspace highlights
 #   - workspaces.py — workspace CRUD (create, add page, notes, descriptions)
 #   - learning.py   — update experience, tool tips, knowledge corrections
+#   - plan.py       — run_plan: several knowledge lookups in one call
 
 from __future__ import annotations
 
+import logging
 from typing import Any, Callable
 
 from tools import knowledge, workspaces, schedule
 from tools.vision import highlight_pages
 from tools.learning import update_experience, update_tool_description, update_knowledge
+from tools.plan import run_plan
+
+logger = logging.getLogger(__name__)
 
 
 def build_tool_registry(
@@ -30,12 +35,36 @@ def build_tool_registry(
 
     All tool functions receive their arguments directly from the model.
     Project-dependent tools get the project wired in via closures.
+
+    The result for the most recent (project, project_id) is reused, so
+    rebuilding for the same project returns the same objects.
     """
+    global _last_registry
+
     # Initialize modules that need the project reference
     knowledge.project = project
     workspaces.init_workspaces(project, project_id)
     schedule.init_schedule(project_id=project_id)
 
+    if _last_registry is not None:
+        cached_project, cached_id, definitions, functions = _last_registry
+        if cached_project is project and cached_id == project_id:
+            return definitions, functions
+
+    definitions, functions = _build_registry(project, project_id)
+    _last_registry = (project, project_id, definitions, functions)
+    return definitions, functions
+
+
+# (project, project_id, definitions, functions) from the last build. Holding
+# the project itself (not its id()) keeps the identity check sound.
+_last_registry: tuple[dict[str, Any] | None, str | None, list[dict[str, Any]], dict[str, Callable]] | None = None
+
+
+def _build_registry(
+    project: dict[str, Any] | None,
+    project_id: str | None,
+) -> tuple[list[dict[str, Any]], dict[str, Callable]]:
     # --- Build function map ---
     functions: dict[str, Callable] = {}
 
@@ -50,7 +79,7 @@ def build_tool_registry(
         if not project:
             return "No project loaded."
         mission_count = len(page_missions) if isinstance(page_missions, list) else 0
-        print(f"\n  [Highlight] Workspace: {workspace_slug} | Missions: {mission_count}")
+        logger.info("  [Highlight] Workspace: %s | Missions: %d", workspace_slug, mission_count)
         return highlight_pages(
             workspace_slug=workspace_slug,
             page_missions=page_missions,
@@ -62,18 +91,18 @@ def build_tool_registry(
 
     # Learning tools (wrapped with project for update_knowledge)
     def _update_experience(file: str, action: str, field: str, value: str, reasoning: str) -> str:
-        print(f"\n  [Learn] update_experience: {file} → {field}")
+        logger.info("  [Learn] update_experience: %s → %s", file, field)
         return update_experience(file, action, field, value, reasoning)
 
     def _update_tool_description(tool_name: str, tips: str) -> str:
-        print(f"\n  [Learn] update_tool_description: {tool_name}")
+        logger.info("  [Learn] update_tool_description: %s", tool_name)
         return update_tool_description(tool_name, tips)
 
     def _update_knowledge(page_name: str, field: str, value: str, reasoning: str, region_id: str | None = None) -> str:
         if not project:
             return "No project loaded."
         target = f"{page_name}/{region_id}" if region_id else page_name
-        print(f"\n  [Learn] update_knowledge: {target} → {field}")
+        logger.info("  [Learn] update_knowledge: %s → %s", target, field)
         return update_knowledge(page_name, field, value, reasoning, region_id=region_id, project=project)
 
     functions["update_experience"] = _update_experience
@@ -88,6 +117,13 @@ def build_tool_registry(
     functions["remove_event"] = schedule.remove_event
     functions["upcoming"] = schedule.upcoming
 
+    # Plan tool (runs knowledge tools only — plans never write)
+    def _run_plan(plan: str) -> dict[str, Any] | str:
+        logger.info("  [Plan] %s", plan)
+        return run_plan(plan, functions, allowed=READ_ONLY_TOOLS)
+
+    functions["run_plan"] = _run_plan
+
     # --- Build definitions list ---
     definitions = (
         KNOWLEDGE_TOOL_DEFINITIONS
@@ -95,11 +131,27 @@ def build_tool_registry(
         + VISION_TOOL_DEFINITIONS
         + LEARNING_TOOL_DEFINITIONS
         + SCHEDULE_TOOL_DEFINITIONS
+        + PLAN_TOOL_DEFINITIONS
     )
 
+    # Give list_pages the project's disciplines as an enum, so the model
+    # picks a valid one instead of guessing a spelling
+    if project and project.get("disciplines"):
+        definitions = [
+            _with_param_enum(tool, "discipline", project["disciplines"]) if tool["name"] == "list_pages" else tool
+            for tool in definitions
+        ]
+
     return definitions, functions
 
 
+def _with_param_enum(tool: dict[str, Any], param: str, values: list[str]) -> dict[str, Any]:
+    """Copy of a tool definition with an enum added to one parameter."""
+    params = dict(tool["params"])
+    params[param] = {**params[param], "enum": list(values)}
+    return {**tool, "params": params}
+
+
 # ==========================================================================
 # Tool Definitions — the model sees these as available tools
 # ==========================================================================
@@ -158,6 +210,10 @@ KNOWLEDGE_TOOL_DEFINITIONS = [
     },
 ]
 
+# Tools that only read the project. Plans may call these, and providers may
+# run several of them at once; everything else runs one at a time, in order.
+READ_ONLY_TOOLS = frozenset(tool["name"] for tool in KNOWLEDGE_TOOL_DEFINITIONS)
+
 WORKSPACE_TOOL_DEFINITIONS = [
     {
         "name": "create_workspace",
@@ -317,3 +373,19 @@ SCHEDULE_TOOL_DEFINITIONS = [
         },
     },
 ]
+
+PLAN_TOOL_DEFINITIONS = [
+    {
+        "name": "run_plan",
+        "description": (
+            "Run several knowledge lookups in one call instead of one call each. "
+            "The plan is one tool call per line or `;`-separated, optionally assigned to a name, "
+            "with literal arguments only. Only knowledge tools are allowed. "
+            "Example: pages = list_pages(\"Mechanical\"); summary = get_sheet_summary(\"M102\"). "
+            "Returns a dict of results keyed by name."
+        ),
+        "params": {
+            "plan": {"type": "string", "description": "Tool calls to run, in order", "required": True},
+        },
+    },
+]
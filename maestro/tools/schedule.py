@@ -8,6 +8,7 @@
 
 from __future__ import annotations
 
+import re
 from datetime import datetime
 from typing import Any
 
@@ -28,14 +29,20 @@ def _require_project_id() -> str | None:
     return _project_id
 
 
+# YYYY-MM-DD, optionally followed by THH:MM or THH:MM:SS. Dates are stored
+# as strings and range-filtered by string comparison, so they must be zero-padded.
+_DATE_SHAPE = re.compile(r"\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}(?::\d{2})?)?")
+
+
 def _parse_date(date_str: str) -> datetime | None:
     """Parse a date or datetime string."""
-    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
-        try:
-            return datetime.strptime(date_str.strip(), fmt)
-        except ValueError:
-            continue
-    return None
+    date_str = date_str.strip()
+    if not _DATE_SHAPE.fullmatch(date_str):
+        return None
+    try:
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        return None
 
 
 # ---------------------------------------------------------------------------
@@ -14,6 +14,17 @@ def _no_project() -> str:
     return "No project loaded. Run: python ingest.py <folder>"
 
 
+_lowered_names: tuple[dict[str, Any], list[tuple[str, str]]] | None = None
+
+
+def _lowered_page_names(pages: dict[str, Any]) -> list[tuple[str, str]]:
+    """(lowercase name, name) pairs, built once per pages dict."""
+    global _lowered_names
+    if _lowered_names is None or _lowered_names[0] is not pages:
+        _lowered_names = (pages, [(name.lower(), name) for name in pages])
+    return _lowered_names[1]
+
+
 def _resolve_page(page_name: str) -> dict[str, Any] | None:
     """Fuzzy-match a page name. Tries exact match first, then prefix/substring."""
     if not project:
@@ -39,9 +50,9 @@ def _resolve_page(page_name: str) -> dict[str, Any] | None:
     # Try substring match (e.g. "Floor_Finish" matches "A111_Floor_Finish_Plan_p001")
     if not candidates:
         lower = normalized.lower()
-        for name, page in pages.items():
-            if lower in name.lower():
-                candidates.append((name, page))
+        for lowered, name in _lowered_page_names(pages):
+            if lower in lowered:
+                candidates.append((name, pages[name]))
 
     if len(candidates) == 1:
         return candidates[0][1]
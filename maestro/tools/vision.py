@@ -6,15 +6,16 @@ import logging
 import os
 import re
 import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
 from dotenv import load_dotenv
-from google import genai
-from google.genai import types
 
 from maestro.db import repository as repo
-from maestro.knowledge.gemini_service import _collect_response
+
+# google.genai (and gemini_service, which imports it) are imported on first
+# use — they pull in a large dependency stack that startup doesn't need.
 
 load_dotenv()
 
@@ -22,19 +23,41 @@ logger = logging.getLogger(__name__)
 GEMINI_MODEL = "gemini-3-flash-preview"
 
 
-_COORD_PATTERN = re.compile(
-    r"\(\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*\)"
-)
-_COORD_BRACKET_PATTERN = re.compile(
-    r"\[\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*\]"
-)
-_BOX2D_PATTERN = re.compile(
-    r"box_2d\s*[:=]\s*\[\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*\]",
-    re.IGNORECASE,
-)
+# Four numbers in (...) or [...] — draw.rectangle((...)), image.crop((...)),
+# box_2d=[...], bbox lists. One alternation so a trace is scanned once.
+_NUM = r"(-?\d+(?:\.\d+)?)"
+_QUAD = rf"\s*{_NUM}\s*,\s*{_NUM}\s*,\s*{_NUM}\s*,\s*{_NUM}\s*"
+_COORD_PATTERN = re.compile(rf"\({_QUAD}\)|\[{_QUAD}\]")
+_BOX_KEYWORDS = ("rectangle", "crop", "box")  # "box" also covers bbox and box_2d
+
+
+# Highlight results keyed by (page image, image mtime, normalized mission).
+# A repeated or re-worded-only mission on an unchanged page reuses the boxes
+# instead of paying for another vision call.
+_HIGHLIGHT_CACHE_MAX = 256
+_highlight_cache: OrderedDict[tuple[str, int, str], list[dict[str, float]]] = OrderedDict()
+_highlight_cache_lock = threading.Lock()
+
+
+def _highlight_cache_get(key: tuple[str, int, str]) -> list[dict[str, float]] | None:
+    with _highlight_cache_lock:
+        bboxes = _highlight_cache.get(key)
+        if bboxes is not None:
+            _highlight_cache.move_to_end(key)
+        return bboxes
+
 
+def _highlight_cache_put(key: tuple[str, int, str], bboxes: list[dict[str, float]]) -> None:
+    with _highlight_cache_lock:
+        _highlight_cache[key] = bboxes
+        _highlight_cache.move_to_end(key)
+        while len(_highlight_cache) > _HIGHLIGHT_CACHE_MAX:
+            _highlight_cache.popitem(last=False)
+
+
+def _get_gemini_client() -> Any:
+    from google import genai
 
-def _get_gemini_client() -> genai.Client:
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise RuntimeError("GEMINI_API_KEY is not set.")
@@ -166,26 +189,21 @@ def _extract_raw_pixel_boxes(text: str) -> list[tuple[float, float, float, float
     if not text:
         return []
 
-    boxes: list[tuple[float, float, float, float]] = []
     lowered = text.lower()
+    if not any(keyword in lowered for keyword in _BOX_KEYWORDS):
+        return []
 
-    for match in _BOX2D_PATTERN.finditer(text):
-        vals = tuple(float(match.group(i)) for i in range(1, 5))
-        boxes.append(vals)
-
-    if "rectangle" in lowered or "crop" in lowered or "bbox" in lowered or "box" in lowered:
-        for match in _COORD_PATTERN.finditer(text):
-            vals = tuple(float(match.group(i)) for i in range(1, 5))
-            boxes.append(vals)
-        for match in _COORD_BRACKET_PATTERN.finditer(text):
-            vals = tuple(float(match.group(i)) for i in range(1, 5))
-            boxes.append(vals)
+    boxes: list[tuple[float, float, float, float]] = []
+    for match in _COORD_PATTERN.finditer(text):
+        groups = match.group(1, 2, 3, 4) if match.group(1) is not None else match.group(5, 6, 7, 8)
+        boxes.append(tuple(float(value) for value in groups))
 
     return boxes
 
 
 def _extract_bboxes_from_trace(trace: list[dict[str, Any]], image_width: int, image_height: int) -> list[dict[str, float]]:
     bboxes: list[dict[str, float]] = []
+    seen_raw: set[tuple[float, float, float, float]] = set()
 
     for entry in trace:
         if not isinstance(entry, dict):
@@ -197,14 +215,66 @@ def _extract_bboxes_from_trace(trace: list[dict[str, Any]], image_width: int, im
         if not isinstance(content, str) or not content.strip():
             continue
 
-        for x1, y1, x2, y2 in _extract_raw_pixel_boxes(content):
-            normalized = _normalize_bbox(x1, y1, x2, y2, image_width, image_height)
+        for raw in _extract_raw_pixel_boxes(content):
+            # The same box often shows up in both the code and its result
+            if raw in seen_raw:
+                continue
+            seen_raw.add(raw)
+            normalized = _normalize_bbox(*raw, image_width, image_height)
             if normalized is not None:
                 bboxes.append(normalized)
 
     return _dedupe_bboxes(bboxes)
 
 
+def _find_bboxes(page_png: Path, page_name: str, mission: str) -> list[dict[str, float]]:
+    """Ask Gemini (with code execution) for mission-relevant boxes on a page image."""
+    from PIL import Image
+    from google.genai import types
+
+    from maestro.knowledge.gemini_service import _collect_response
+
+    with Image.open(page_png) as img:
+        image_width, image_height = img.size
+
+    client = _get_gemini_client()
+    response = client.models.generate_content(
+        model=GEMINI_MODEL,
+        contents=[
+            types.Content(
+                parts=[
+                    types.Part.from_bytes(data=page_png.read_bytes(), mime_type="image/png"),
+                    types.Part.from_text(
+                        text=(
+                            "You are analyzing a construction plan page.\\n\\n"
+                            f"PAGE: {page_name}\\n"
+                            f"MISSION: {mission}\\n\\n"
+                            "Use code execution to inspect the image and identify rectangular regions relevant "
+                            "to the mission. Think with code naturally."
+                        )
+                    ),
+                ]
+            )
+        ],
+        config=types.GenerateContentConfig(
+            temperature=0,
+            thinking_config=types.ThinkingConfig(thinking_level="high"),
+            tools=[types.Tool(code_execution=types.ToolCodeExecution)],
+        ),
+    )
+
+    collected = _collect_response(response)
+    trace = collected.get("trace", [])
+    bboxes = _extract_bboxes_from_trace(
+        trace,
+        image_width=image_width or 1,
+        image_height=image_height or 1,
+    )
+    if not bboxes:
+        raise RuntimeError("No valid bbox coordinates found in Gemini trace.")
+    return bboxes
+
+
 def _run_highlight_agent(
     workspace_slug: str,
     page_name: str,
@@ -219,46 +289,11 @@ def _run_highlight_agent(
         if not page_png.exists():
             raise RuntimeError(f"No image for '{project_page_name}'.")
 
-        from PIL import Image
-
-        with Image.open(page_png) as img:
-            image_width, image_height = img.size
-
-        client = _get_gemini_client()
-        response = client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=[
-                types.Content(
-                    parts=[
-                        types.Part.from_bytes(data=page_png.read_bytes(), mime_type="image/png"),
-                        types.Part.from_text(
-                            text=(
-                                "You are analyzing a construction plan page.\\n\\n"
-                                f"PAGE: {page_name}\\n"
-                                f"MISSION: {mission}\\n\\n"
-                                "Use code execution to inspect the image and identify rectangular regions relevant "
-                                "to the mission. Think with code naturally."
-                            )
-                        ),
-                    ]
-                )
-            ],
-            config=types.GenerateContentConfig(
-                temperature=0,
-                thinking_config=types.ThinkingConfig(thinking_level="high"),
-                tools=[types.Tool(code_execution=types.ToolCodeExecution)],
-            ),
-        )
-
-        collected = _collect_response(response)
-        trace = collected.get("trace", [])
-        bboxes = _extract_bboxes_from_trace(
-            trace,
-            image_width=image_width or 1,
-            image_height=image_height or 1,
-        )
-        if not bboxes:
-            raise RuntimeError("No valid bbox coordinates found in Gemini trace.")
+        cache_key = (str(page_png), page_png.stat().st_mtime_ns, _normalize_token(mission))
+        bboxes = _highlight_cache_get(cache_key)
+        if bboxes is None:
+            bboxes = _find_bboxes(page_png, page_name, mission)
+            _highlight_cache_put(cache_key, bboxes)
 
         completed = repo.complete_highlight(highlight_id, bboxes)
         if isinstance(completed, str):
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_left
 from typing import Any, Callable
 
 from maestro.db import repository as repo
@@ -18,50 +19,79 @@ def init_workspaces(project: dict[str, Any] | None, project_id: str | None) -> N
     _project_id = project_id
 
 
+# Runs of anything but lowercase letters and digits (underscores included)
+# collapse to a single "_", so no second pass is needed.
+_SLUG_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
 def _slugify(title: str) -> str:
-    slug = re.sub(r"[^a-z0-9]+", "_", title.lower())
-    slug = re.sub(r"_+", "_", slug).strip("_")
-    return slug or "workspace"
+    return _normalize_token(title) or "workspace"
 
 
 def _normalize_token(value: str) -> str:
-    token = re.sub(r"[^a-z0-9]+", "_", value.lower())
-    return re.sub(r"_+", "_", token).strip("_")
+    return _SLUG_SEPARATORS.sub("_", value.lower()).strip("_")
+
+
+class _CandidateIndex:
+    """Page names prepared for fuzzy resolution.
+
+    Names are normalized once and kept sorted by normalized form, so a
+    prefix lookup is a bisect and a substring scan doesn't re-run the
+    normalizing regexes on every name.
+    """
+
+    def __init__(self, names: list[str]):
+        self.names = set(names)
+        self.normalized = sorted((_normalize_token(name), name) for name in names)
+        self.keys = [norm for norm, _ in self.normalized]
 
+    def prefixed(self, prefix: str) -> list[str]:
+        matches = []
+        for norm, name in self.normalized[bisect_left(self.keys, prefix):]:
+            if not norm.startswith(prefix):
+                break
+            matches.append(name)
+        return sorted(matches)
 
-def _project_page_names() -> list[str]:
-    if not _project:
-        return []
-    pages = _project.get("pages", {})
-    if not isinstance(pages, dict):
-        return []
-    return sorted([name for name in pages.keys() if isinstance(name, str)])
+    def containing(self, part: str) -> list[str]:
+        return sorted(name for norm, name in self.normalized if part in norm)
 
 
-def _resolve_candidate_name(query: str, candidates: list[str]) -> tuple[str | None, list[str]]:
-    if not candidates:
+# Built once per loaded project (the pages dict is replaced, never renamed in place)
+_project_index: tuple[Any, _CandidateIndex] | None = None
+
+
+def _project_page_index() -> _CandidateIndex:
+    global _project_index
+    pages = _project.get("pages", {}) if _project else {}
+    if _project_index is None or _project_index[0] is not pages:
+        names = [name for name in pages.keys() if isinstance(name, str)] if isinstance(pages, dict) else []
+        _project_index = (pages, _CandidateIndex(names))
+    return _project_index[1]
+
+
+def _resolve_candidate_name(query: str, candidates: _CandidateIndex) -> tuple[str | None, list[str]]:
+    if not candidates.names:
         return None, []
 
     raw = query.strip()
     if not raw:
         return None, []
 
-    if raw in candidates:
+    if raw in candidates.names:
         return raw, []
 
     normalized_query = _normalize_token(raw)
     if not normalized_query:
         return None, []
 
-    normalized = {name: _normalize_token(name) for name in candidates}
-
-    prefix_matches = sorted([name for name in candidates if normalized[name].startswith(normalized_query)])
+    prefix_matches = candidates.prefixed(normalized_query)
     if len(prefix_matches) == 1:
         return prefix_matches[0], []
     if len(prefix_matches) > 1:
         return None, prefix_matches
 
-    substring_matches = sorted([name for name in candidates if normalized_query in normalized[name]])
+    substring_matches = candidates.containing(normalized_query)
     if len(substring_matches) == 1:
         return substring_matches[0], []
     if len(substring_matches) > 1:
@@ -71,7 +101,7 @@ def _resolve_candidate_name(query: str, candidates: list[str]) -> tuple[str | No
 
 
 def _resolve_project_page_name(page_name: str) -> tuple[str | None, list[str]]:
-    return _resolve_candidate_name(page_name, _project_page_names())
+    return _resolve_candidate_name(page_name, _project_page_index())
 
 
 def _resolve_workspace_slug(workspace_slug: str) -> str | None:
@@ -93,7 +123,7 @@ def _resolve_workspace_page_name(workspace_slug: str, page_name: str) -> tuple[s
         return None, [], slug
 
     page_names = [str(item.get("page_name", "")) for item in ws.get("pages", []) if isinstance(item, dict)]
-    resolved, ambiguous = _resolve_candidate_name(page_name, page_names)
+    resolved, ambiguous = _resolve_candidate_name(page_name, _CandidateIndex(page_names))
     return resolved, ambiguous, slug
 
 
@@ -12,13 +12,15 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import os
 import sys
-import threading
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 
+import orjson
 import uvicorn
 from fastapi import FastAPI, Request
 
@@ -31,9 +33,10 @@ sys.path.insert(0, str(MAESTRO_ROOT / "maestro"))
 
 from messaging.sendblue import send_message as sendblue_send, send_typing_indicator, format_for_imessage
 from messaging.conversation import Conversation
-from engine.heartbeat import run_heartbeat, record_heartbeat, _load_state
+from engine.heartbeat import run_heartbeat, record_heartbeat, seconds_until_next_heartbeat, _load_state
 from tools.schedule import upcoming as schedule_upcoming
 from tools.workspaces import list_workspaces
+from tools.knowledge import check_gaps
 from maestro.api.routes import api_router, init_api
 from maestro.api.websocket import ws_router, emit_message, emit_heartbeat, emit_finding, emit_status
 
@@ -44,8 +47,21 @@ from maestro.api.websocket import ws_router, emit_message, emit_heartbeat, emit_
 
 conversation: Conversation | None = None
 super_phone: str = ""
-heartbeat_thread: threading.Thread | None = None
-heartbeat_stop = threading.Event()
+heartbeat_task: asyncio.Task | None = None
+heartbeat_stop = asyncio.Event()
+
+# Outbound Sendblue calls: (kind, number, text) with kind "typing" or "msg".
+# One worker drains it in order, so handlers never wait on Sendblue.
+outbound_queue: asyncio.Queue[tuple[str, str, str] | None] = asyncio.Queue()
+outbound_task: asyncio.Task | None = None
+
+# Shortest wait between heartbeat attempts, so a heartbeat that errors out
+# (and never gets recorded) is retried a minute later rather than in a spin.
+HEARTBEAT_RETRY_SECONDS = 60
+
+# While a reply streams in, re-send the typing indicator this often so it
+# doesn't time out on the super's phone during long generations.
+TYPING_REFRESH_SECONDS = 2.0
 
 
 # ---------------------------------------------------------------------------
@@ -64,80 +80,122 @@ def _safe_print(text: str) -> None:
 # Heartbeat background worker
 # ---------------------------------------------------------------------------
 
-def _heartbeat_loop():
-    """Background thread that runs heartbeats on interval.
+async def _heartbeat_loop():
+    """Background task that runs heartbeats on the event loop.
 
-    Uses the heartbeat module's own timing logic (should_heartbeat)
-    to decide when to fire. We just poll every 60s and let the
-    heartbeat module decide if it's time.
+    Sleeps until the heartbeat module says the next heartbeat is due
+    (seconds_until_next_heartbeat), runs one, and repeats. The heartbeat
+    module still makes the final call via should_heartbeat.
     """
-    global conversation, super_phone
-
     _safe_print("[Heartbeat] Background worker started")
 
+    failed = False
     while not heartbeat_stop.is_set():
-        heartbeat_stop.wait(60)  # Check every 60 seconds
-        if heartbeat_stop.is_set():
+        delay = seconds_until_next_heartbeat(_load_state())
+        delay = max(delay, HEARTBEAT_RETRY_SECONDS if failed else 1.0)
+        try:
+            await asyncio.wait_for(heartbeat_stop.wait(), timeout=delay)
             break
+        except asyncio.TimeoutError:
+            pass
 
         if not conversation or not super_phone:
             continue
 
         try:
-            # Gather inputs for the heartbeat decision
-            schedule_events = []
-            try:
-                result = schedule_upcoming(days="2")
-                if isinstance(result, list):
-                    schedule_events = result
-            except Exception:
-                pass
+            await _run_heartbeat_once()
+            failed = False
+        except Exception as exc:
+            failed = True
+            _safe_print(f"[Heartbeat] Error: {exc}")
 
-            workspaces = []
-            try:
-                result = list_workspaces()
-                if isinstance(result, dict):
-                    workspaces = result.get("workspaces", [])
-                elif isinstance(result, list):
-                    workspaces = result
-            except Exception:
-                pass
 
-            gaps = []  # TODO: wire up check_gaps
+async def _run_heartbeat_once():
+    """Gather inputs, make the heartbeat decision, and act on it.
+
+    Blocking calls (tools, engine, Sendblue) run on the default executor.
+    """
+    loop = asyncio.get_running_loop()
+
+    # Gather inputs for the heartbeat decision (independent, so fetched concurrently)
+    sched_result, ws_result, gaps_result = await asyncio.gather(
+        loop.run_in_executor(None, lambda: schedule_upcoming(days="2")),
+        loop.run_in_executor(None, list_workspaces),
+        loop.run_in_executor(None, check_gaps),
+        return_exceptions=True,
+    )
+
+    schedule_events = sched_result if isinstance(sched_result, list) else []
+
+    workspaces = []
+    if isinstance(ws_result, dict):
+        workspaces = ws_result.get("workspaces", [])
+    elif isinstance(ws_result, list):
+        workspaces = ws_result
+
+    gaps = gaps_result if isinstance(gaps_result, list) else []
+
+    # Run the heartbeat decision
+    decision = run_heartbeat(schedule_events, workspaces, gaps, conversation.project)
+
+    if decision.get("mode") == "skip":
+        return
+
+    mode = decision["mode"]
+    prompt = decision.get("prompt", "")
+    should_message = decision.get("should_message", False)
 
-            # Run the heartbeat decision
-            decision = run_heartbeat(schedule_events, workspaces, gaps, conversation.project)
+    _safe_print(f"\n[Heartbeat] Mode: {mode} | Reason: {decision.get('reason', '')}")
+    emit_heartbeat(mode, decision.get("reason", ""), should_message)
 
-            if decision.get("mode") == "skip":
-                continue
+    if not prompt:
+        return
 
-            mode = decision["mode"]
-            prompt = decision.get("prompt", "")
-            should_message = decision.get("should_message", False)
+    # Feed the heartbeat prompt through the engine
+    response = await loop.run_in_executor(None, conversation.send, prompt)
+    _safe_print(f"[Heartbeat] Response: {response[:200]}...")
 
-            _safe_print(f"\n[Heartbeat] Mode: {mode} | Reason: {decision.get('reason', '')}")
-            emit_heartbeat(mode, decision.get("reason", ""), should_message)
+    # Record the heartbeat
+    record_heartbeat(_load_state(), decision)
 
-            if not prompt:
-                continue
+    # Send to super if warranted
+    if should_message and response and super_phone:
+        formatted = format_for_imessage(response)
+        text = f"[Maestro] {formatted}"
+        _queue_outbound("msg", super_phone, text)
+        _safe_print(f"[Heartbeat] Queued finding for {super_phone}")
+        emit_finding(response)
 
-            # Feed the heartbeat prompt through the engine (same thread)
-            response = conversation.send(prompt)
-            _safe_print(f"[Heartbeat] Response: {response[:200]}...")
 
-            # Record the heartbeat
-            record_heartbeat(_load_state(), decision)
+# ---------------------------------------------------------------------------
+# Outbound Sendblue worker
+# ---------------------------------------------------------------------------
+
+def _queue_outbound(kind: str, number: str, text: str = "") -> None:
+    """Queue a Sendblue call. Must be called on the event loop thread."""
+    outbound_queue.put_nowait((kind, number, text))
 
-            # Send to super if warranted
-            if should_message and response and super_phone:
-                formatted = format_for_imessage(response)
-                text = f"[Maestro] {formatted}"
-                sendblue_send(super_phone, text)
-                _safe_print(f"[Heartbeat] Sent finding to {super_phone}")
-                emit_finding(response)
 
+async def _outbound_worker():
+    """Send queued typing indicators and messages, one at a time, in order.
+
+    A None item stops the worker once everything before it has been sent.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await outbound_queue.get()
+        if item is None:
+            break
+        kind, number, text = item
+        try:
+            if kind == "typing":
+                await loop.run_in_executor(None, send_typing_indicator, number)
+            else:
+                await loop.run_in_executor(None, sendblue_send, number, text)
         except Exception as exc:
-            _safe_print(f"[Heartbeat] Error: {exc}")
+            # Typing indicators are best effort; failed messages are worth a log line
+            if kind != "typing":
+                _safe_print(f"[Sendblue] Failed to send to {number}: {exc}")
 
 
 # ---------------------------------------------------------------------------
@@ -146,14 +204,20 @@ def _heartbeat_loop():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Start heartbeat worker on startup, stop on shutdown."""
-    global heartbeat_thread
-    heartbeat_thread = threading.Thread(target=_heartbeat_loop, daemon=True)
-    heartbeat_thread.start()
+    """Start heartbeat and outbound workers on startup, stop on shutdown."""
+    global heartbeat_task, outbound_task
+    heartbeat_stop.clear()
+    outbound_task = asyncio.create_task(_outbound_worker())
+    heartbeat_task = asyncio.create_task(_heartbeat_loop())
     yield
     heartbeat_stop.set()
-    if heartbeat_thread:
-        heartbeat_thread.join(timeout=5)
+    outbound_queue.put_nowait(None)
+    for task in (heartbeat_task, outbound_task):
+        if task:
+            try:
+                await asyncio.wait_for(task, timeout=5)
+            except asyncio.TimeoutError:
+                task.cancel()
 
 
 app = FastAPI(title="Maestro", lifespan=lifespan)
@@ -162,15 +226,32 @@ app.include_router(ws_router)
 
 # Serve knowledge_store page images as static files
 from fastapi.staticfiles import StaticFiles
+
+
+class _PageImageFiles(StaticFiles):
+    """StaticFiles that lets browsers cache page images.
+
+    Page PNGs only change on re-ingest, so the dashboard can reuse them for
+    an hour without asking; after that the ETag check turns a refetch into
+    a 304.
+    """
+
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = "public, max-age=3600"
+        return response
+
+
 _ks_path = MAESTRO_ROOT / "knowledge_store"
 if _ks_path.exists():
-    app.mount("/static/pages", StaticFiles(directory=str(_ks_path)), name="pages")
+    app.mount("/static/pages", _PageImageFiles(directory=str(_ks_path)), name="pages")
 
 
 @app.post("/sendblue-webhook")
 async def sendblue_webhook(request: Request):
     """Receive incoming iMessages from Sendblue."""
-    body = await request.json()
+    body = orjson.loads(await request.body())
 
     from_number = body.get("from_number", body.get("number", ""))
     content = body.get("content", "").strip()
@@ -205,26 +286,39 @@ async def _handle_message(from_number: str, content: str):
     """Handle an incoming message (runs in background)."""
     try:
         # Show typing indicator while Maestro thinks
-        send_typing_indicator(from_number)
+        _queue_outbound("typing", from_number)
         emit_message("user", content)
 
-        # Run the engine (blocking, so use thread)
-        response = await asyncio.get_event_loop().run_in_executor(
-            None, conversation.send, content
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        first_chunk_at: float | None = None
+        last_typing = started
+
+        def on_text(chunk: str) -> None:
+            # Called from the engine thread for each streamed text chunk
+            nonlocal first_chunk_at, last_typing
+            now = time.perf_counter()
+            if first_chunk_at is None:
+                first_chunk_at = now
+                _safe_print(f"[iMessage] First token after {int((now - started) * 1000)} ms")
+            if now - last_typing >= TYPING_REFRESH_SECONDS:
+                last_typing = now
+                loop.call_soon_threadsafe(_queue_outbound, "typing", from_number)
+
+        # Run the engine (blocking, so use thread); the reply streams in via on_text
+        response = await loop.run_in_executor(
+            None, lambda: conversation.send(content, on_text=on_text)
         )
 
         if response:
             formatted = format_for_imessage(response)
-            sendblue_send(from_number, formatted)
+            _queue_outbound("msg", from_number, formatted)
             emit_message("assistant", response)
-            _safe_print(f"[iMessage] Sent reply to {from_number}: {formatted[:100]}...")
+            _safe_print(f"[iMessage] Queued reply to {from_number}: {formatted[:100]}...")
 
     except Exception as exc:
         _safe_print(f"[iMessage] Error handling message from {from_number}: {exc}")
-        try:
-            sendblue_send(from_number, "Sorry, I hit an error processing that. Try again?")
-        except Exception:
-            pass
+        _queue_outbound("msg", from_number, "Sorry, I hit an error processing that. Try again?")
 
 
 @app.get("/health")
@@ -252,6 +346,12 @@ async def stats():
 def main():
     global conversation, super_phone
 
+    # Tool-call and learning logs ([Tool], [Learn], ...) go through logging.
+    # Show ours at INFO; third-party libraries stay at WARNING.
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logging.getLogger("engine").setLevel(logging.INFO)
+    logging.getLogger("tools").setLevel(logging.INFO)
+
     # Get phone number
     if len(sys.argv) > 1:
         super_phone = sys.argv[1]
@@ -302,7 +402,15 @@ def main():
     print(f"  Heartbeats running in background")
     print(f"\n  Press Ctrl+C to stop.\n")
 
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="warning")
+    # "auto" picks uvloop and httptools when installed (see requirements.txt),
+    # falling back to asyncio/h11 where they aren't available (e.g. Windows).
+    # Dashboard frames are small JSON events, so permessage-deflate only adds
+    # latency and CPU; it's turned off.
+    uvicorn.run(
+        app, host="0.0.0.0", port=8000,
+        loop="auto", http="auto", ws_per_message_deflate=False,
+        log_level="warning",
+    )
 
 
 if __name__ == "__main__":
@@ -8,6 +8,7 @@
 import sys
 import os
 from pathlib import Path
+from types import MappingProxyType
 
 PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
 MAESTRO_DIR = str(Path(__file__).resolve().parent.parent / "maestro")
@@ -15,25 +16,82 @@ sys.path.insert(0, PROJECT_ROOT)
 sys.path.insert(0, MAESTRO_DIR)
 os.environ["DATABASE_URL"] = "sqlite://"
 
+import orjson
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+
 from maestro.db import session as db_session
 from maestro.db import repository as repo
 
-# Use shared in-memory SQLite (same DB across all connections)
-db_session.configure("sqlite:///file::memory:?cache=shared&uri=true")
+# One in-memory SQLite connection shared by every session (and the TestClient)
+db_session.configure("sqlite://", poolclass=StaticPool)
+
+
+# Throwaway DB: skip durability bookkeeping on every write
+@event.listens_for(db_session.engine, "connect")
+def _fast_pragmas(dbapi_connection, _record):
+    for pragma in ("synchronous=OFF", "journal_mode=MEMORY", "temp_store=MEMORY"):
+        dbapi_connection.execute(f"PRAGMA {pragma}")
+
+
 db_session.init_db()
 
-# Seed data
+# Seed data — one transaction for everything that doesn't need a repo call's return value
+from datetime import datetime, timedelta, timezone
+from maestro.db.models import ConversationState, Message, ScheduleEvent, Workspace, WorkspaceNote, WorkspacePage
+
 p = repo.get_or_create_project("CFA Love Field", "/data/cfa")
 PID = p["id"]
 
-# Workspaces
-repo.create_workspace(PID, "Foundation & Framing", "Grade beams + framing", "foundation_framing")
-repo.create_workspace(PID, "Kitchen Rough-In", "All kitchen MEP", "kitchen_rough_in")
-repo.add_page(PID, "foundation_framing", "S-101")
-repo.add_page(PID, "foundation_framing", "S-102")
-repo.add_description(PID, "foundation_framing", "S-101", "Structural foundation")
-repo.add_note(PID, "foundation_framing", "Pipe sleeves missing from structural sheets", source_page="VC-201")
-repo.add_note(PID, "foundation_framing", "Epoxy anchor inspection required")
+
+def _seed_bulk(project_id):
+    """Seed workspaces, pages, notes, schedule, and conversation with a single commit."""
+    foundation = Workspace(
+        project_id=project_id, slug="foundation_framing",
+        title="Foundation & Framing", description="Grade beams + framing",
+    )
+    foundation.pages = [
+        WorkspacePage(page_name="S-101", description="Structural foundation"),
+        WorkspacePage(page_name="S-102", description=""),
+    ]
+    foundation.notes = [
+        WorkspaceNote(text="Pipe sleeves missing from structural sheets", source_page="VC-201"),
+        WorkspaceNote(text="Epoxy anchor inspection required"),
+    ]
+    kitchen = Workspace(
+        project_id=project_id, slug="kitchen_rough_in",
+        title="Kitchen Rough-In", description="All kitchen MEP",
+    )
+
+    events = [
+        ScheduleEvent(id="evt_pour0001", project_id=project_id, title="Foundation Pour",
+                      start="2026-02-20", end="2026-02-20", type="milestone"),
+        ScheduleEvent(id="evt_kitch001", project_id=project_id, title="Kitchen Rough-In Start",
+                      start="2026-03-01", end="2026-03-15", type="phase"),
+    ]
+
+    # Explicit timestamps keep message order stable (get_messages sorts by created_at)
+    started = datetime.now(timezone.utc)
+    messages = [
+        Message(project_id=project_id, role=role, content=content, created_at=started + timedelta(seconds=i))
+        for i, (role, content) in enumerate([
+            ("user", "What about the foundation?"),
+            ("assistant", "The foundation shows post-tensioned grade beams."),
+            ("user", "Any coordination issues?"),
+            ("assistant", "Yes - pipe sleeves through grade beams not on structural."),
+        ])
+    ]
+    state = ConversationState(
+        project_id=project_id,
+        summary="Discussed foundation. Found pipe sleeve gap.",
+        total_exchanges=2,
+    )
+
+    with db_session.get_session() as s:
+        s.add_all([foundation, kitchen, *events, *messages, state])
+
+
+_seed_bulk(PID)
 
 _highlight = repo.add_highlight(PID, "foundation_framing", "S-101", "Find pipe sleeves")
 HIGHLIGHT_ID = _highlight["highlight"]["id"] if isinstance(_highlight, dict) else -1
@@ -42,19 +100,6 @@ repo.complete_highlight(
     [{"x": 0.15, "y": 0.2, "width": 0.12, "height": 0.08}],
 )
 
-# Schedule
-repo.add_event(PID, "Foundation Pour", "2026-02-20", event_type="milestone")
-repo.add_event(PID, "Kitchen Rough-In Start", "2026-03-01", end="2026-03-15", event_type="phase")
-
-# Conversation
-repo.get_or_create_conversation(PID)
-repo.add_message(PID, "user", "What about the foundation?")
-repo.add_message(PID, "assistant", "The foundation shows post-tensioned grade beams.")
-repo.add_message(PID, "user", "Any coordination issues?")
-repo.add_message(PID, "assistant", "Yes - pipe sleeves through grade beams not on structural.")
-repo.update_conversation_state(PID, summary="Discussed foundation. Found pipe sleeve gap.", increment_exchanges=True)
-repo.update_conversation_state(PID, increment_exchanges=True)
-
 # Mock project (knowledge store)
 MOCK_PROJECT = {
     "name": "CFA Love Field",
@@ -88,18 +133,33 @@ MOCK_PROJECT = {
     },
 }
 
-# Mock conversation object
+
+def _freeze(value):
+    """Read-only view of nested fixture data, so a route that mutates the knowledge store fails loudly."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+MOCK_PROJECT = _freeze(MOCK_PROJECT)
+
+# Mock conversation object (fixtures built once; routes only read them)
+MOCK_TOOL_DEFINITIONS = tuple({"name": f"tool_{i}"} for i in range(29))
+MOCK_STATS = {
+    "engine": "opus",
+    "context_limit": 1000000,
+    "estimated_tokens": 5000,
+    "usage_pct": "0.5%",
+    "messages_in_memory": 4,
+}
+
 class MockConversation:
     engine_name = "opus"
-    tool_definitions = [{"name": f"tool_{i}"} for i in range(29)]
+    tool_definitions = MOCK_TOOL_DEFINITIONS
     def get_stats(self):
-        return {
-            "engine": "opus",
-            "context_limit": 1000000,
-            "estimated_tokens": 5000,
-            "usage_pct": "0.5%",
-            "messages_in_memory": 4,
-        }
+        return MOCK_STATS
 
 # Initialize API
 from maestro.api.routes import api_router, init_api
@@ -112,14 +172,17 @@ from fastapi.testclient import TestClient
 app = FastAPI()
 app.include_router(api_router, prefix="/api")
 
-# Need httpx for TestClient
-try:
-    client = TestClient(app)
-except Exception:
-    print("Installing httpx for TestClient...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "httpx", "--quiet"])
-    client = TestClient(app)
+# TestClient needs httpx (listed in requirements.txt)
+client = TestClient(app)
+
+# Enter once so lifespan runs once and every section shares the same client
+client.__enter__()
+
+
+def _json(response):
+    """Parse a response body with orjson (faster than httpx's stdlib json)."""
+    return orjson.loads(response.content)
+
 
 passed = 0
 failed = 0
@@ -140,7 +203,7 @@ print("\n== /api/health ==")
 
 r = client.get("/api/health")
 test("health 200", r.status_code == 200)
-data = r.json()
+data = _json(r)
 test("health status ok", data["status"] == "ok")
 test("health engine", data["engine"] == "opus")
 test("health project_id", data["project_id"] == PID)
@@ -152,7 +215,7 @@ print("\n== /api/project ==")
 
 r = client.get("/api/project")
 test("project 200", r.status_code == 200)
-data = r.json()
+data = _json(r)
 test("project name", data["name"] == "CFA Love Field")
 test("project page_count", data["page_count"] == 3)
 test("project pointer_count", data["pointer_count"] == 3)
@@ -165,7 +228,7 @@ print("\n== /api/workspaces ==")
 
 r = client.get("/api/workspaces")
 test("workspaces 200", r.status_code == 200)
-data = r.json()
+data = _json(r)
 test("workspaces is list", isinstance(data, list))
 test("workspaces count", len(data) == 2)
 test("workspace titles", {w["title"] for w in data} == {"Foundation & Framing", "Kitchen Rough-In"})
@@ -176,7 +239,7 @@ print("\n== /api/workspaces/:slug ==")
 
 r = client.get("/api/workspaces/foundation_framing")
 test("workspace by slug 200", r.status_code == 200)
-data = r.json()
+data = _json(r)
 test("workspace metadata", data["metadata"]["title"] == "Foundation & Framing")
 test("workspace pages", len(data["pages"]) == 2)
 test("workspace notes", len(data["notes"]) == 2)
@@ -205,21 +268,22 @@ print("\n== /api/schedule ==")
 
 r = client.get("/api/schedule")
 test("schedule 200", r.status_code == 200)
-data = r.json()
+data = _json(r)
 test("schedule has events", len(data["events"]) == 2)
 test("schedule count", data["count"] == 2)
+SCHEDULE_EVENTS = data["events"]
 
 # Date filter
 r2 = client.get("/api/schedule?from_date=2026-02-01&to_date=2026-02-28")
-test("schedule date filter", len(r2.json()["events"]) == 1)
+test("schedule date filter", len(_json(r2)["events"]) == 1)
 
 # Type filter
 r3 = client.get("/api/schedule?event_type=milestone")
-test("schedule type filter", len(r3.json()["events"]) == 1)
+test("schedule type filter", len(_json(r3)["events"]) == 1)
 
 # Empty result
 r4 = client.get("/api/schedule?from_date=2025-01-01&to_date=2025-12-31")
-test("schedule empty", r4.json()["count"] == 0)
+test("schedule empty", _json(r4)["count"] == 0)
 
 # ===================================================================
 print("\n== /api/schedule/upcoming ==")
@@ -227,17 +291,16 @@ print("\n== /api/schedule/upcoming ==")
 
 r = client.get("/api/schedule/upcoming?days=60")
 test("upcoming 200", r.status_code == 200)
-test("upcoming has days", r.json()["days"] == 60)
+test("upcoming has days", _json(r)["days"] == 60)
 
 # ===================================================================
 print("\n== /api/schedule/:event_id ==")
 # ===================================================================
 
-events = client.get("/api/schedule").json()["events"]
-eid = events[0]["id"]
+eid = SCHEDULE_EVENTS[0]["id"]
 r = client.get(f"/api/schedule/{eid}")
 test("event by id 200", r.status_code == 200)
-test("event title", r.json()["title"] == "Foundation Pour")
+test("event title", _json(r)["title"] == "Foundation Pour")
 
 r2 = client.get("/api/schedule/evt_fake")
 test("event 404", r2.status_code == 404)
@@ -248,7 +311,7 @@ print("\n== /api/conversation ==")
 
 r = client.get("/api/conversation")
 test("conversation 200", r.status_code == 200)
-data = r.json()
+data = _json(r)
 test("conversation summary", "pipe sleeve" in data["summary"])
 test("conversation exchanges", data["total_exchanges"] == 2)
 test("conversation engine", data["engine"] == "opus")
@@ -260,7 +323,7 @@ print("\n== /api/conversation/messages ==")
 
 r = client.get("/api/conversation/messages")
 test("messages 200", r.status_code == 200)
-data = r.json()
+data = _json(r)
 test("messages count", data["count"] == 4)
 test("messages total", data["total"] == 4)
 test("messages ordered", data["messages"][0]["role"] == "user")
@@ -268,12 +331,12 @@ test("first message content", "foundation" in data["messages"][0]["content"].low
 
 # Limit
 r2 = client.get("/api/conversation/messages?limit=2")
-test("messages limit", r2.json()["count"] == 2)
+test("messages limit", _json(r2)["count"] == 2)
 
 # Before (pagination)
 last_id = data["messages"][-1]["id"]
 r3 = client.get(f"/api/conversation/messages?before={last_id}")
-test("messages before", r3.json()["count"] == 3)  # All except last
+test("messages before", _json(r3)["count"] == 3)  # All except last
 
 # ===================================================================
 print("\n== /api/knowledge/disciplines ==")
@@ -281,7 +344,7 @@ print("\n== /api/knowledge/disciplines ==")
 
 r = client.get("/api/knowledge/disciplines")
 test("disciplines 200", r.status_code == 200)
-data = r.json()
+data = _json(r)
 test("3 disciplines", len(data["disciplines"]) == 3)
 names = {d["name"] for d in data["disciplines"]}
 test("discipline names", names == {"Structural", "Architectural", "MEP"})
@@ -299,13 +362,13 @@ print("\n== /api/knowledge/pages ==")
 
 r = client.get("/api/knowledge/pages")
 test("pages 200", r.status_code == 200)
-data = r.json()
+data = _json(r)
 test("3 pages", data["count"] == 3)
 test("page has fields", all(k in data["pages"][0] for k in ["page_name", "discipline", "pointer_count"]))
 
 # Filter by discipline
 r2 = client.get("/api/knowledge/pages?discipline=Structural")
-test("pages filter", r2.json()["count"] == 1)
+test("pages filter", _json(r2)["count"] == 1)
 
 # ===================================================================
 print("\n== /api/knowledge/pages/:name ==")
@@ -313,7 +376,7 @@ print("\n== /api/knowledge/pages/:name ==")
 
 r = client.get("/api/knowledge/pages/S-101 Structural Foundation Plan")
 test("page detail 200", r.status_code == 200)
-data = r.json()
+data = _json(r)
 test("page name", data["page_name"] == "S-101 Structural Foundation Plan")
 test("page discipline", data["discipline"] == "Structural")
 test("page reflection", "grade beam" in data["sheet_reflection"].lower())
@@ -329,22 +392,24 @@ print("\n== /api/knowledge/search ==")
 
 r = client.get("/api/knowledge/search?q=concrete")
 test("search 200", r.status_code == 200)
-data = r.json()
+data = _json(r)
 test("search has results", data["count"] >= 1)
 test("search query echo", data["query"] == "concrete")
 
 # Search pointers
 r2 = client.get("/api/knowledge/search?q=grade beam")
-test("search pointers", any(r["type"] == "pointer" for r in r2.json()["results"]))
+test("search pointers", any(r["type"] == "pointer" for r in _json(r2)["results"]))
 
 # Search no results
 r3 = client.get("/api/knowledge/search?q=xyznonexistent")
-test("search empty", r3.json()["count"] == 0)
+test("search empty", _json(r3)["count"] == 0)
 
 # Search across disciplines
 r4 = client.get("/api/knowledge/search?q=kitchen")
-test("search cross-discipline", r4.json()["count"] >= 1)
+test("search cross-discipline", _json(r4)["count"] >= 1)
+
 
+client.__exit__(None, None, None)
 
 # ===================================================================
 # Summary
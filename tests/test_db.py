@@ -16,6 +16,15 @@ os.environ["DATABASE_URL"] = "sqlite://"
 from maestro.db.models import Base
 from maestro.db.session import engine, get_session
 from maestro.db import repository as repo
+from sqlalchemy import event
+
+
+# Throwaway DB: skip durability bookkeeping on every write
+@event.listens_for(engine, "connect")
+def _fast_pragmas(dbapi_connection, _record):
+    for pragma in ("synchronous=OFF", "journal_mode=MEMORY", "temp_store=MEMORY"):
+        dbapi_connection.execute(f"PRAGMA {pragma}")
+
 
 # Recreate tables on in-memory DB
 Base.metadata.create_all(engine)
@@ -74,7 +83,7 @@ repo.create_workspace(PID, "Kitchen Rough-In", "All kitchen MEP", "kitchen_rough
 # List
 ws_list = repo.list_workspaces(PID)
 test("list_workspaces count", len(ws_list) == 2)
-test("list_workspaces has titles", {w["title"] for w in ws_list} == {"Foundation & Framing", "Kitchen Rough-In"})
+test("list_workspaces in creation order", [w["title"] for w in ws_list] == ["Foundation & Framing", "Kitchen Rough-In"])
 
 # Resolve slug — exact
 test("resolve exact slug", repo.resolve_workspace_slug(PID, "foundation_framing") == "foundation_framing")
@@ -242,6 +251,7 @@ test("create conversation state", cs["total_exchanges"] == 0)
 # Idempotent
 cs2 = repo.get_or_create_conversation(PID)
 test("conversation state idempotent", cs2["id"] == cs["id"])
+test("read conversation state", repo.get_conversation_state(PID)["id"] == cs["id"])
 
 # Add messages
 m1 = repo.add_message(PID, "user", "Hey Maestro, what about the foundation?")
@@ -252,6 +262,8 @@ test("add_message returns ids", m1 < m2 < m3 < m4)
 
 # Count
 test("count_messages", repo.count_messages(PID) == 4)
+test("count_message_chars", repo.count_message_chars(PID) == sum(len(m["content"]) for m in repo.get_messages(PID)))
+test("count_message_chars unknown project", repo.count_message_chars("nope") == 0)
 
 # Get all messages
 all_msgs = repo.get_messages(PID)
@@ -270,21 +282,36 @@ test("get_messages offset", len(offset_msgs) == 2 and offset_msgs[0]["id"] == m3
 recent = repo.get_recent_messages(PID, count=2)
 test("get_recent_messages", len(recent) == 2 and recent[0]["id"] == m3 and recent[1]["id"] == m4)
 
+# Recent window + total in one call
+window, total = repo.get_message_window(PID, count=2)
+test("get_message_window recent", [m["id"] for m in window] == [m3, m4] and total == 4)
+window, total = repo.get_message_window(PID, count=2, before=m4)
+test("get_message_window before", [m["id"] for m in window] == [m2, m3] and total == 4)
+
 # Delete old messages (simulate compaction)
 deleted = repo.delete_messages_before(PID, m3)
 test("delete_messages_before", deleted == 2)
 test("remaining after delete", repo.count_messages(PID) == 2)
 
-# Update conversation state
-repo.update_conversation_state(PID, summary="Foundation discussion. Pipe sleeves identified.", increment_exchanges=True)
-cs3 = repo.get_or_create_conversation(PID)
+# Bulk add (one INSERT)
+bulk_ids = repo.add_messages_bulk(PID, [("user", "What's on S-101?"), ("assistant", "Foundation plan.")])
+test("add_messages_bulk returns ids in order", len(bulk_ids) == 2 and m4 < bulk_ids[0] < bulk_ids[1])
+recent = repo.get_messages(PID)
+test("add_messages_bulk persisted in order", [m["id"] for m in recent[-2:]] == bulk_ids and recent[-1]["role"] == "assistant")
+test("add_messages_bulk empty", repo.add_messages_bulk(PID, []) == [])
+
+# Update conversation state (all fields in one call, then one read)
+repo.update_conversation_state(
+    PID,
+    summary="Foundation discussion. Pipe sleeves identified.",
+    increment_exchanges=1,
+    increment_compactions=1,
+)
+cs3 = repo.get_conversation_state(PID)
 test("update summary", cs3["summary"] == "Foundation discussion. Pipe sleeves identified.")
 test("increment exchanges", cs3["total_exchanges"] == 1)
-
-repo.update_conversation_state(PID, increment_compactions=True)
-cs4 = repo.get_or_create_conversation(PID)
-test("increment compactions", cs4["compactions"] == 1)
-test("last_compaction set", cs4["last_compaction"] != "")
+test("increment compactions", cs3["compactions"] == 1)
+test("last_compaction set", cs3["last_compaction"] != "")
 
 # ===================================================================
 print("\n🔹 EXPERIENCE LOG")
@@ -315,16 +342,30 @@ repo.get_or_create_conversation(tp["id"])
 # Delete the project — everything should cascade
 with get_session() as s:
     from maestro.db.models import Project, Workspace, WorkspacePage, WorkspaceNote, ScheduleEvent, Message, ConversationState
-    proj = s.query(Project).get(tp["id"])
+    proj = s.get(Project, tp["id"])
     s.delete(proj)
 
-# Verify all children are gone
+# Verify all children are gone (every count in one SELECT)
+from sqlalchemy import func, select
+
+
+def _count_for(model):
+    return select(func.count()).select_from(model).where(model.project_id == tp["id"]).scalar_subquery()
+
+
 with get_session() as s:
-    test("cascade: project gone", s.query(Project).get(tp["id"]) is None)
-    test("cascade: workspaces gone", s.query(Workspace).filter(Workspace.project_id == tp["id"]).count() == 0)
-    test("cascade: events gone", s.query(ScheduleEvent).filter(ScheduleEvent.project_id == tp["id"]).count() == 0)
-    test("cascade: messages gone", s.query(Message).filter(Message.project_id == tp["id"]).count() == 0)
-    test("cascade: conv state gone", s.query(ConversationState).filter(ConversationState.project_id == tp["id"]).count() == 0)
+    projects, workspaces, events, messages, states = s.execute(select(
+        select(func.count()).select_from(Project).where(Project.id == tp["id"]).scalar_subquery(),
+        _count_for(Workspace),
+        _count_for(ScheduleEvent),
+        _count_for(Message),
+        _count_for(ConversationState),
+    )).one()
+    test("cascade: project gone", projects == 0)
+    test("cascade: workspaces gone", workspaces == 0)
+    test("cascade: events gone", events == 0)
+    test("cascade: messages gone", messages == 0)
+    test("cascade: conv state gone", states == 0)
 
 # ===================================================================
 # Summary
@@ -17,11 +17,27 @@ sys.path.insert(0, PROJECT_ROOT)
 sys.path.insert(0, MAESTRO_DIR)  # Match server.py convention for bare imports
 os.environ["DATABASE_URL"] = "sqlite://"
 
-from maestro.db.models import Base
-from maestro.db.session import engine, get_session, init_db
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+
+from maestro.db import session as db_session
+from maestro.db.session import get_session
 from maestro.db import repository as repo
 
-Base.metadata.create_all(engine)
+# One in-memory SQLite connection shared by every session, including ones
+# opened from tool worker threads
+db_session.configure("sqlite://", poolclass=StaticPool)
+
+
+# Throwaway DB: skip durability bookkeeping on every write. EXCLUSIVE locking
+# is safe here because the StaticPool only ever opens one connection.
+@event.listens_for(db_session.engine, "connect")
+def _fast_pragmas(dbapi_connection, _record):
+    for pragma in ("synchronous=OFF", "journal_mode=MEMORY", "temp_store=MEMORY", "locking_mode=EXCLUSIVE"):
+        dbapi_connection.execute(f"PRAGMA {pragma}")
+
+
+db_session.init_db()
 
 passed = 0
 failed = 0
@@ -100,8 +116,8 @@ ws = list_workspaces()
 test("returns dict", isinstance(ws, dict))
 test("has workspaces list", isinstance(ws.get("workspaces"), list))
 test("count = 3", len(ws["workspaces"]) == 3)
-titles = {w["title"] for w in ws["workspaces"]}
-test("all titles present", titles == {"Foundation & Framing", "Kitchen Rough-In", "Walk-In Cooler"})
+titles = [w["title"] for w in ws["workspaces"]]
+test("titles in creation order", titles == ["Foundation & Framing", "Kitchen Rough-In", "Walk-In Cooler"])
 
 # --- get_workspace ---
 print("\n  -- get_workspace --")
@@ -343,6 +359,48 @@ with get_session() as s:
     test("details is JSON", "patterns.json" in entries[0].details)
     test("third tool name", entries[2].tool == "update_tool_description")
 
+# A read during a slow flush must still see the new data, not the old file
+import threading
+from maestro.tools.learning import _ExperienceWriter
+
+
+class _SlowPath:
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.text = None
+
+    def write_text(self, text, encoding):
+        self.started.set()
+        self.release.wait(2)
+        self.text = text
+
+
+writer = _ExperienceWriter(60)
+slow = _SlowPath()
+writer.schedule(slow, {"items": ["a"]})
+flusher = threading.Thread(target=writer.flush)
+flusher.start()
+slow.started.wait(2)
+seen = writer.read(slow)
+test("read during flush sees pending data", seen == {"items": ["a"]})
+writer.schedule(slow, {"items": ["a", "b"]})
+slow.release.set()
+flusher.join(2)
+test("newer schedule survives flush", writer.read(slow) == {"items": ["a", "b"]})
+writer.flush()
+test("newer data reaches disk", slow.text is not None and '"b"' in slow.text)
+
+# A new system prompt flushes pending learning first
+import tools.learning as live_learning
+from identity.prompt import build_system_prompt
+
+pending_path = _SlowPath()
+pending_path.release.set()
+live_learning._writer.schedule(pending_path, {"items": ["tip"]})
+build_system_prompt()
+test("system prompt flushes pending learning", pending_path.text is not None)
+
 
 # ===================================================================
 print("\n== REGISTRY INTEGRATION ==")
@@ -353,9 +411,9 @@ from maestro.tools.registry import build_tool_registry
 defs, funcs = build_tool_registry(MOCK_PROJECT, project_id=PID)
 
 test("definitions is list", isinstance(defs, list))
-test("28 tool definitions", len(defs) == 28, f"got {len(defs)}")
+test("29 tool definitions", len(defs) == 29, f"got {len(defs)}")
 test("functions is dict", isinstance(funcs, dict))
-test("28 tool functions", len(funcs) == 28, f"got {len(funcs)}")
+test("29 tool functions", len(funcs) == 29, f"got {len(funcs)}")
 
 # Check all definition names have matching functions
 def_names = {d["name"] for d in defs}
@@ -377,6 +435,73 @@ test("registry list_workspaces works", isinstance(result, dict) and len(result.g
 result = funcs["list_events"]()
 test("registry list_events works", isinstance(result, list))
 
+# list_pages gets the project's disciplines as an enum
+enum_defs, _ = build_tool_registry({**MOCK_PROJECT, "disciplines": ["Architectural", "Structural"]}, project_id=PID)
+list_pages_def = next(d for d in enum_defs if d["name"] == "list_pages")
+test("list_pages discipline enum", list_pages_def["params"]["discipline"].get("enum") == ["Architectural", "Structural"])
+test("shared definition untouched", "enum" not in next(d for d in defs if d["name"] == "list_pages")["params"]["discipline"])
+again_defs, again_funcs = build_tool_registry(MOCK_PROJECT, project_id=PID)
+test("registry rebuilt after project change", again_defs is not defs)
+test("registry cache hit", build_tool_registry(MOCK_PROJECT, project_id=PID)[1] is again_funcs)
+
+# Run a plan through registry
+result = funcs["run_plan"]('d = list_disciplines(); list_pages(discipline="Structural")')
+test("run_plan returns keyed results", isinstance(result, dict) and set(result) == {"d", "2_list_pages"})
+test("run_plan rejects write tools", isinstance(funcs["run_plan"]('add_note("x", "y")'), str))
+test("run_plan rejects non-literal args", isinstance(funcs["run_plan"]('list_pages(__import__("os"))'), str))
+
+# Provider tool execution: reads may overlap, writes run alone and in order
+import threading
+import time as _time
+from engine.providers.tool_calls import execute_tools
+
+running: list[str] = []
+overlaps: list[tuple[str, ...]] = []
+running_lock = threading.Lock()
+
+
+def _tracked(name):
+    def fn(**kwargs):
+        with running_lock:
+            running.append(name)
+            overlaps.append(tuple(running))
+        _time.sleep(0.02)
+        with running_lock:
+            running.remove(name)
+        return name
+    return fn
+
+
+tracked = {name: _tracked(name) for name in ("search", "list_pages", "update_experience", "add_note")}
+calls = [("search", {}), ("list_pages", {}), ("update_experience", {}), ("add_note", {}), ("search", {})]
+test("execute_tools keeps call order", execute_tools(calls, tracked) == [c[0] for c in calls])
+test("read-only calls overlap", any(len(o) == 2 for o in overlaps))
+test("write calls run alone", all(len(o) == 1 for o in overlaps if "update_experience" in o or "add_note" in o))
+test("execute_tools unknown tool", execute_tools([("nope", {})], tracked) == ["Unknown function: nope"])
+
+# The arity cache must not keep a tool (or what it closes over) alive
+import gc
+import weakref
+from engine.providers import tool_calls
+
+
+class _Owner:
+    pass
+
+
+owner = _Owner()
+owner_ref = weakref.ref(owner)
+
+
+def closure(engine):  # Closes over its owner, like Conversation's switch_engine
+    return owner
+
+
+test("execute_tools closure result", execute_tools([("switch", {"engine": "x"})], {"switch": closure}) == [owner])
+del owner, closure
+gc.collect()
+test("arity cache releases tool owners", owner_ref() is None)
+
 
 # ===================================================================
 print("\n== CONVERSATION (rewired to DB) ==")
@@ -389,12 +514,14 @@ print("\n  -- message flow --")
 # Simulate a conversation
 repo.get_or_create_conversation(PID)
 
-m1 = repo.add_message(PID, "user", "What's the foundation look like?")
-m2 = repo.add_message(PID, "assistant", "The foundation plan shows post-tensioned grade beams...")
-m3 = repo.add_message(PID, "user", "Are there pipe sleeves?")
-m4 = repo.add_message(PID, "assistant", "Yes, VC sheets show 3-inch sleeves through grade beams.")
-m5 = repo.add_message(PID, "user", "What about the pour date?")
-m6 = repo.add_message(PID, "assistant", "Foundation pour is scheduled for Feb 25.")
+m1, m2, m3, m4, m5, m6 = repo.add_messages_bulk(PID, [
+    ("user", "What's the foundation look like?"),
+    ("assistant", "The foundation plan shows post-tensioned grade beams..."),
+    ("user", "Are there pipe sleeves?"),
+    ("assistant", "Yes, VC sheets show 3-inch sleeves through grade beams."),
+    ("user", "What about the pour date?"),
+    ("assistant", "Foundation pour is scheduled for Feb 25."),
+])
 
 test("6 messages stored", repo.count_messages(PID) == 6)
 
@@ -410,7 +537,7 @@ test("4 remaining", repo.count_messages(PID) == 4)
 repo.update_conversation_state(
     PID,
     summary="Discussed foundation plan. Post-tensioned grade beams. Pipe sleeves confirmed on VC sheets.",
-    increment_compactions=True,
+    increment_compactions=1,
 )
 
 state = repo.get_or_create_conversation(PID)
@@ -419,14 +546,14 @@ test("compaction count", state["compactions"] == 1)
 test("last_compaction set", state["last_compaction"] != "")
 
 # Second round of messages
-m7 = repo.add_message(PID, "user", "What trades need to coordinate?")
-m8 = repo.add_message(PID, "assistant", "Structural, plumbing, and vapor mitigation all intersect at the grade beams.")
+m7, m8 = repo.add_messages_bulk(PID, [
+    ("user", "What trades need to coordinate?"),
+    ("assistant", "Structural, plumbing, and vapor mitigation all intersect at the grade beams."),
+])
 test("messages accumulate", repo.count_messages(PID) == 6)
 
 # Increment exchanges
-repo.update_conversation_state(PID, increment_exchanges=True)
-repo.update_conversation_state(PID, increment_exchanges=True)
-repo.update_conversation_state(PID, increment_exchanges=True)
+repo.update_conversation_state(PID, increment_exchanges=3)
 state = repo.get_or_create_conversation(PID)
 test("exchange count", state["total_exchanges"] == 3)
 
@@ -434,7 +561,7 @@ test("exchange count", state["total_exchanges"] == 3)
 repo.update_conversation_state(
     PID,
     summary="Foundation: PT grade beams, 3\" pipe sleeves (VC), pour Feb 25. Coordination: structural + plumbing + VC.",
-    increment_compactions=True,
+    increment_compactions=1,
 )
 state = repo.get_or_create_conversation(PID)
 test("summary updated", "Coordination" in state["summary"])
@@ -477,20 +604,65 @@ test("compaction prompt has new", "Super: What about" in prompt)
 prompt_no_summary = _build_compaction_prompt("", text)
 test("compaction prompt no summary", "EXISTING SUMMARY" not in prompt_no_summary)
 
+print("\n  -- direct routing --")
+from maestro.messaging.conversation import _try_direct_route
+
+route_tools = {
+    "list_disciplines": lambda: ["Architectural", "Structural"],
+    "list_pages": lambda discipline=None: [{"name": "S-101 Structural Foundation Plan"}],
+    "get_sheet_summary": lambda page_name: f"Page '{page_name}' not found. Use list_pages() to see available pages.",
+}
+test("route list disciplines", _try_direct_route("list disciplines", route_tools) == "Disciplines: Architectural, Structural")
+test("route pages in", _try_direct_route("pages in structural", route_tools) == "S-101 Structural Foundation Plan")
+test("route missing sheet falls through", _try_direct_route("S-999", route_tools) is None)
+test("route open question falls through", _try_direct_route("What rebar is on S-101?", route_tools) is None)
+route_tools["get_sheet_summary"] = lambda page_name: f"{page_name}: foundation plan"
+test("route what's on sheet", _try_direct_route("what's on S-101?", route_tools) == "S-101: foundation plan")
+test("route show me sheet", _try_direct_route("show me sheet E101", route_tools) == "E101: foundation plan")
+
+print("\n  -- project index in prompt --")
+from maestro.identity.prompt import build_project_index
+
+index_text = build_project_index({"pages": {
+    "S-101": {"discipline": "Structural"},
+    "A-201": {"discipline": "Architectural"},
+    "A-101": {"discipline": "Architectural"},
+}})
+test("index groups by discipline", "Architectural: A-101, A-201" in index_text)
+test("index lists every discipline", "Structural: S-101" in index_text)
+test("index empty without project", build_project_index(None) == "")
+
+from maestro.identity.prompt import build_project_knowledge, INLINE_KNOWLEDGE_MAX_CHARS
+
+knowledge_text = build_project_knowledge({"pages": {"S-101": {"sheet_reflection": "Footings and grade beams."}}})
+test("knowledge inlines sheet summaries", "[S-101] Footings and grade beams." in knowledge_text)
+big_project = {"pages": {"S-101": {"sheet_reflection": "x" * (INLINE_KNOWLEDGE_MAX_CHARS + 1)}}}
+test("knowledge skipped when over budget", build_project_knowledge(big_project) == "")
+
+print("\n  -- page resolution --")
+from maestro.tools import knowledge as knowledge_tools
+
+saved_project = knowledge_tools.project
+knowledge_tools.project = {"pages": {name: {"name": name} for name in [
+    "A1110_Door_Schedule_p001", "A111_Floor_Finish_Plan_p001", "S-101 Structural Foundation Plan",
+]}}
+test("sheet code beats longer prefix", knowledge_tools._resolve_page_name("A111") == "A111_Floor_Finish_Plan_p001")
+test("sheet code ignores case and dashes", knowledge_tools._resolve_page_name("s101") == "S-101 Structural Foundation Plan")
+test("substring fallback still works", knowledge_tools._resolve_page_name("Door_Schedule") == "A1110_Door_Schedule_p001")
+knowledge_tools.project = saved_project
+
 
 # ===================================================================
 # Cross-domain: workspace + schedule in same project
 # ===================================================================
 print("\n== CROSS-DOMAIN INTEGRITY ==")
 
-# Verify workspace and schedule data coexist correctly
-ws_list = list_workspaces()
-evt_list = list_events()
-test("workspaces still there", isinstance(ws_list, dict) and len(ws_list.get("workspaces", [])) == 3)
-test("events still there", isinstance(evt_list, list) and len(evt_list) == 2)
-
-# Messages still there
-test("messages still there", repo.count_messages(PID) == 6)
+# Verify workspace, schedule, and message data coexist correctly (one session)
+snapshot = repo.get_project_snapshot(PID)
+test("workspaces still there", len(snapshot["workspaces"]) == 3)
+test("events still there", len(snapshot["events"]) == 2)
+test("messages still there", snapshot["message_count"] == 6)
+test("snapshot matches list_events", snapshot["events"] == repo.list_events(PID))
 
 # Get workspace with all its data
 ws = get_workspace("foundation_framing")
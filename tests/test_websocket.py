@@ -4,6 +4,7 @@
 #
 # Run: python tests/test_websocket.py
 
+import asyncio
 import sys
 import os
 import time
@@ -14,6 +15,7 @@ MAESTRO_DIR = str(Path(__file__).resolve().parent.parent / "maestro")
 sys.path.insert(0, PROJECT_ROOT)
 sys.path.insert(0, MAESTRO_DIR)
 
+import orjson
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
@@ -32,8 +34,8 @@ from maestro.api.websocket import (
     emit_page_highlight_complete,
     emit_page_highlight_failed,
     emit_status,
-    _clients,
 )
+from maestro.api import websocket as ws_module  # _clients is rebound on connect/disconnect
 
 app = FastAPI()
 app.include_router(ws_router)
@@ -53,20 +55,25 @@ def test(name, condition, detail=""):
         print(f"  [FAIL] {name} -- {detail}")
 
 
+def _recv(ws):
+    """Read one frame and parse it with orjson (faster than receive_json's stdlib json)."""
+    return orjson.loads(ws.receive_text())
+
+
 # ===================================================================
 print("\n== WebSocket Connection ==")
 # ===================================================================
 
 with client.websocket_connect("/ws") as ws:
     # Should receive connected event
-    data = ws.receive_json()
+    data = _recv(ws)
     test("connected event", data["type"] == "connected")
     test("connected has clients", data["clients"] == 1)
     test("connected has time", "time" in data)
 
     # Ping/pong
     ws.send_text("ping")
-    pong = ws.receive_json()
+    pong = _recv(ws)
     test("pong response", pong["type"] == "pong")
     test("pong has time", "time" in pong)
 
@@ -77,11 +84,11 @@ print("\n== Event Broadcasting ==")
 
 with client.websocket_connect("/ws") as ws:
     # Consume the connected event
-    ws.receive_json()
+    _recv(ws)
 
     # Test emit_message
     emit_message("user", "What about the foundation?", message_id=42)
-    data = ws.receive_json()
+    data = _recv(ws)
     test("message type", data["type"] == "message")
     test("message role", data["role"] == "user")
     test("message content", "foundation" in data["content"])
@@ -90,12 +97,12 @@ with client.websocket_connect("/ws") as ws:
 
     # Test emit_message (assistant)
     emit_message("assistant", "The grade beams show post-tensioned design.")
-    data = ws.receive_json()
+    data = _recv(ws)
     test("assistant message", data["role"] == "assistant")
 
     # Test emit_heartbeat
     emit_heartbeat("targeted", "Active workspace: Foundation & Framing", should_message=True)
-    data = ws.receive_json()
+    data = _recv(ws)
     test("heartbeat type", data["type"] == "heartbeat")
     test("heartbeat mode", data["mode"] == "targeted")
     test("heartbeat reason", "Foundation" in data["reason"])
@@ -103,7 +110,7 @@ with client.websocket_connect("/ws") as ws:
 
     # Test emit_finding
     emit_finding("3-inch pipe sleeves missing from structural sheets", workspace_slug="foundation_framing", source_page="VC-201")
-    data = ws.receive_json()
+    data = _recv(ws)
     test("finding type", data["type"] == "finding")
     test("finding text", "pipe sleeves" in data["text"])
     test("finding workspace", data["workspace_slug"] == "foundation_framing")
@@ -111,14 +118,14 @@ with client.websocket_connect("/ws") as ws:
 
     # Test emit_workspace_change
     emit_workspace_change("page_added", "foundation_framing", detail="Added S-103")
-    data = ws.receive_json()
+    data = _recv(ws)
     test("workspace type", data["type"] == "workspace")
     test("workspace action", data["action"] == "page_added")
     test("workspace slug", data["workspace_slug"] == "foundation_framing")
 
     # Test description update emitter
     emit_page_description_updated("foundation_framing", "S-101", "Structural foundation page details")
-    data = ws.receive_json()
+    data = _recv(ws)
     test("description update type", data["type"] == "workspace")
     test("description update action", data["action"] == "page_description_updated")
     test("description update page", data["page_name"] == "S-101")
@@ -126,7 +133,7 @@ with client.websocket_connect("/ws") as ws:
 
     # Test highlight start/complete emitters
     emit_page_highlight_started("foundation_framing", "S-101", highlight_id=7, mission="Find pipe sleeves")
-    data = ws.receive_json()
+    data = _recv(ws)
     test("highlight started action", data["action"] == "page_highlight_started")
     test("highlight started id", data["highlight_id"] == 7)
     test("highlight started mission", data["mission"] == "Find pipe sleeves")
@@ -138,67 +145,125 @@ with client.websocket_connect("/ws") as ws:
         mission="Find pipe sleeves",
         bboxes=[{"x": 0.1, "y": 0.2, "width": 0.25, "height": 0.12}],
     )
-    data = ws.receive_json()
+    data = _recv(ws)
     test("highlight complete action", data["action"] == "page_highlight_complete")
     test("highlight complete id", data["highlight_id"] == 7)
     test("highlight complete bboxes", isinstance(data["bboxes"], list) and len(data["bboxes"]) == 1)
 
     emit_page_highlight_failed("foundation_framing", "S-101", highlight_id=8)
-    data = ws.receive_json()
+    data = _recv(ws)
     test("highlight failed action", data["action"] == "page_highlight_failed")
     test("highlight failed id", data["highlight_id"] == 8)
 
     # Test emit_schedule_change
     emit_schedule_change("added", "evt_abc123", title="Foundation Pour")
-    data = ws.receive_json()
+    data = _recv(ws)
     test("schedule type", data["type"] == "schedule")
     test("schedule action", data["action"] == "added")
     test("schedule event_id", data["event_id"] == "evt_abc123")
 
     # Test emit_compaction
     emit_compaction(deleted_count=15, new_token_estimate=25000, context_limit=1000000)
-    data = ws.receive_json()
+    data = _recv(ws)
     test("compaction type", data["type"] == "compaction")
     test("compaction deleted", data["deleted_messages"] == 15)
     test("compaction tokens", data["estimated_tokens"] == 25000)
 
     # Test emit_engine_switch
     emit_engine_switch("opus", "gemini-flash")
-    data = ws.receive_json()
+    data = _recv(ws)
     test("engine_switch type", data["type"] == "engine_switch")
     test("engine_switch old", data["old_engine"] == "opus")
     test("engine_switch new", data["new_engine"] == "gemini-flash")
 
     # Test emit_status
     emit_status({"engine": "opus", "usage_pct": "5.2%", "messages_in_memory": 20})
-    data = ws.receive_json()
+    data = _recv(ws)
     test("status type", data["type"] == "status")
     test("status engine", data["engine"] == "opus")
     test("status usage", data["usage_pct"] == "5.2%")
 
 
+# ===================================================================
+print("\n== Burst Batching ==")
+# ===================================================================
+
+batch = orjson.loads(ws_module._batch_frame(['{"type":"message","n":1}', '{"type":"status","n":2}']))
+test("batch frame type", batch["type"] == "batch")
+test("batch frame events in order", [e["n"] for e in batch["events"]] == [1, 2])
+
+with client.websocket_connect("/ws") as ws:
+    _recv(ws)  # connected
+    for i in range(5):
+        emit_message("user", f"burst {i}")
+
+    # Each frame is a single event or a batch of them, depending on timing
+    received = []
+    while len(received) < 5:
+        frame = _recv(ws)
+        received.extend(frame["events"] if frame["type"] == "batch" else [frame])
+    test("burst delivers every event", len(received) == 5)
+    test("burst keeps order", [e["content"] for e in received] == [f"burst {i}" for i in range(5)])
+
+
 # ===================================================================
 print("\n== Multiple Clients ==")
 # ===================================================================
 
 with client.websocket_connect("/ws") as ws1:
-    ws1.receive_json()  # connected
+    _recv(ws1)  # connected
     with client.websocket_connect("/ws") as ws2:
-        ws2.receive_json()  # connected
+        _recv(ws2)  # connected
 
-        test("two clients connected", len(_clients) == 2)
+        test("two clients connected", len(ws_module._clients) == 2)
         emit_message("user", "Broadcast to all")
-        d2 = ws2.receive_json()
+        d2 = _recv(ws2)
         test("client 2 receives", d2["type"] == "message")
         test("broadcast content", "Broadcast to all" in d2["content"])
 
 
+# ===================================================================
+print("\n== Slow Client Overflow ==")
+# ===================================================================
+
+class _StalledSocket:
+    closed_with = None
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+stalled = _StalledSocket()
+outbox = ws_module._Outbox(maxsize=1)
+outbox.put("backlog")
+ws_module._add_client(stalled, outbox)
+
+dropped_before = ws_module.dropped_events
+asyncio.run(ws_module.broadcast({"type": "status", "engine": "opus"}))
+asyncio.run(ws_module.broadcast({"type": "status", "engine": "gpt"}))
+test("client kept while status events overflow", stalled in ws_module._clients)
+test("newer status replaces unsent one", ws_module.dropped_events == dropped_before + 1)
+pending = outbox.take()
+test("only latest status pending", len(pending) == 2 and '"engine":"gpt"' in pending[-1])
+
+outbox.put("backlog")
+
+
+async def _overflow_with_message():
+    await ws_module.broadcast({"type": "message", "role": "user", "content": "x"})
+    await asyncio.sleep(0)  # let the close task run
+
+asyncio.run(_overflow_with_message())
+test("client dropped on ordered queue overflow", stalled not in ws_module._clients)
+test("dropped client closed", stalled.closed_with == 1013)
+
+
 # ===================================================================
 print("\n== Disconnection Cleanup ==")
 # ===================================================================
 
 # After all contexts exit, clients should be cleaned up
-test("clients cleaned up", len(_clients) == 0, f"still {len(_clients)} connected")
+test("clients cleaned up", len(ws_module._clients) == 0, f"still {len(ws_module._clients)} connected")
 
 
 # ===================================================================
@@ -6,6 +6,8 @@ import unittest
 import uuid
 from pathlib import Path
 
+from sqlalchemy.pool import StaticPool
+
 MAESTRO_DIR = Path(__file__).resolve().parents[1]
 if str(MAESTRO_DIR) not in sys.path:
     sys.path.insert(0, str(MAESTRO_DIR))
@@ -18,9 +20,9 @@ from maestro.db.models import Base
 from maestro.db.session import engine
 from maestro.tools import workspaces
 
-# Shared in-memory SQLite across all sessions in this process
+# One in-memory SQLite connection shared by all sessions in this process
 # (matches other test modules in this repo).
-db_session.configure("sqlite:///file::memory:?cache=shared&uri=true")
+db_session.configure("sqlite://", poolclass=StaticPool)
 db_session.init_db()
 
 